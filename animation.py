@@ -0,0 +1,122 @@
+"""
+ANIMATION SCHEDULER
+One frame clock that drives every UI animation.
+
+Instead of each effect rescheduling itself with root.after forever, effects
+register with the scheduler, which runs a single after() loop capped at
+`fps`. Animations belong to the current screen and are dropped by
+clear_screen(), so returning to a screen never stacks a second copy.
+The loop pauses while the window is minimized and stops entirely when
+nothing is animating.
+"""
+import sys
+import time
+import tkinter as tk
+
+from profiler import callback_name
+
+
+class Animation:
+    __slots__ = ("callback", "interval", "next_due", "persistent", "active")
+
+    def __init__(self, callback, interval, next_due, persistent):
+        self.callback = callback
+        self.interval = interval
+        self.next_due = next_due
+        self.persistent = persistent
+        self.active = True
+
+
+class AnimationScheduler:
+    def __init__(self, root, fps=60):
+        self.root = root
+        self.animations = []
+        self.paused = False
+        self._after_id = None
+        self.profiler = None   # optional profiler.LoopProfiler
+        self.set_fps(fps)
+
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+
+    def set_fps(self, fps):
+        self.fps = max(1, fps)
+        self.frame_ms = max(1, round(1000 / self.fps))
+
+    # ============================
+    # REGISTRATION
+    # ============================
+    def add(self, callback, interval_ms, persistent=False):
+        """
+        Call callback() every interval_ms (rounded up to whole frames).
+        Returning False from the callback stops it. Non-persistent
+        animations are dropped by clear_screen().
+        """
+        anim = Animation(callback, interval_ms / 1000, time.monotonic(), persistent)
+        self.animations.append(anim)
+        self._ensure_running()
+        return anim
+
+    def cancel(self, anim):
+        anim.active = False
+
+    def clear_screen(self):
+        """Drop every animation tied to the current screen."""
+        for anim in self.animations:
+            if not anim.persistent:
+                anim.active = False
+        self.animations = [a for a in self.animations if a.active]
+
+    # ============================
+    # FRAME LOOP
+    # ============================
+    def _ensure_running(self):
+        if self._after_id is None and not self.paused and self.animations:
+            self._after_id = self.root.after(self.frame_ms, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+
+        try:
+            for anim in list(self.animations):
+                if not anim.active or now < anim.next_due:
+                    continue
+                started = time.perf_counter() if self.profiler else 0.0
+                try:
+                    keep = anim.callback()
+                except tk.TclError:
+                    keep = False   # widget was destroyed under us
+                except Exception:
+                    # a broken animation stops itself, not the shared clock
+                    keep = False
+                    self.root.report_callback_exception(*sys.exc_info())
+                if self.profiler:
+                    self.profiler.record(callback_name(anim.callback), "animation", started,
+                                         time.perf_counter(), now - anim.next_due)
+                if keep is False:
+                    anim.active = False
+                else:
+                    # skip missed frames instead of bursting to catch up
+                    anim.next_due = max(anim.next_due + anim.interval, now)
+        finally:
+            self.animations = [a for a in self.animations if a.active]
+            self._ensure_running()
+
+    def pause(self):
+        self.paused = True
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def resume(self):
+        self.paused = False
+        self._ensure_running()
+
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self.pause()
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self.resume()
@@ -0,0 +1,185 @@
+"""
+AUDIO
+Sound effects for RSA Vault, played by a single background worker.
+
+Tones are rendered once into in-memory WAV buffers. UI code only drops an
+event name into a small bounded queue; the worker plays it on whichever
+backend is available. Hover events that pile up while a sound is playing
+are merged into one, and events are dropped outright when the queue is
+full, so a fast mouse sweep can never stack up threads or lag the UI.
+
+Backends: "winsound" (Windows), "linux" (aplay / paplay / pw-play) and
+"null" (silent, for headless runs and tests). Pick one with
+RSA_VAULT_AUDIO=<name>, otherwise the first one that works is used.
+"""
+import io
+import math
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import wave
+from functools import lru_cache
+
+SAMPLE_RATE = 22050
+VOLUME = 0.35
+
+# event name -> (frequency Hz, duration ms)
+TONES = {
+    "hover": (2400, 15),
+    "click": (900, 120),
+}
+
+QUEUE_SIZE = 8
+
+
+@lru_cache(maxsize=None)
+def render_tone(freq, ms):
+    """A mono 16-bit sine tone as WAV bytes, with a short fade to avoid clicks."""
+    count = SAMPLE_RATE * ms // 1000
+    fade = max(1, min(count // 4, SAMPLE_RATE // 500))
+    samples = bytearray()
+    for i in range(count):
+        env = min(1.0, i / fade, (count - i) / fade)
+        value = int(32767 * VOLUME * env * math.sin(2 * math.pi * freq * i / SAMPLE_RATE))
+        samples += struct.pack("<h", value)
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(bytes(samples))
+    return buf.getvalue()
+
+
+# ============================
+# BACKENDS
+# ============================
+class NullBackend:
+    name = "null"
+
+    def play(self, wav):
+        pass
+
+
+class WinsoundBackend:
+    name = "winsound"
+
+    def __init__(self):
+        import winsound   # only exists on Windows
+        self.winsound = winsound
+
+    def play(self, wav):
+        self.winsound.PlaySound(wav, self.winsound.SND_MEMORY)
+
+
+class LinuxBackend:
+    """Pipes the WAV buffer into the first command-line player found."""
+    name = "linux"
+    PLAYERS = (["aplay", "-q", "-"], ["paplay"], ["pw-play", "-"])
+
+    def __init__(self):
+        for cmd in self.PLAYERS:
+            if shutil.which(cmd[0]):
+                self.cmd = cmd
+                break
+        else:
+            raise RuntimeError("no command-line audio player found")
+
+    def play(self, wav):
+        subprocess.run(self.cmd, input=wav, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+
+
+BACKENDS = {
+    "winsound": WinsoundBackend,
+    "linux": LinuxBackend,
+    "null": NullBackend,
+}
+
+
+def select_backend(name=None):
+    """Backend by name, else RSA_VAULT_AUDIO, else the first one that loads."""
+    name = name or os.environ.get("RSA_VAULT_AUDIO")
+    if name:
+        return BACKENDS[name]()
+
+    order = ["winsound"] if sys.platform == "win32" else ["linux"]
+    for candidate in order:
+        try:
+            return BACKENDS[candidate]()
+        except (ImportError, RuntimeError):
+            continue
+    return NullBackend()
+
+
+# ============================
+# WORKER
+# ============================
+class AudioWorker:
+    def __init__(self, backend=None):
+        self.backend = backend or select_backend()
+        self.events = queue.Queue(maxsize=QUEUE_SIZE)
+        self.dropped = 0
+        self.merged = 0
+        self._hover_pending = False
+
+        # render every tone up front so the first hover is not late
+        self.sounds = {name: render_tone(*spec) for name, spec in TONES.items()}
+
+        self._thread = None
+        if not isinstance(self.backend, NullBackend):
+            self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+            self._thread.start()
+
+    def play(self, name):
+        """Queue a sound; never blocks the caller."""
+        if self._thread is None:
+            return
+        if name == "hover":
+            # one queued hover is enough; later ones merge into it
+            if self._hover_pending:
+                self.merged += 1
+                return
+            self._hover_pending = True
+        try:
+            self.events.put_nowait(name)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self._thread is not None:
+            try:
+                self.events.put_nowait(None)
+            except queue.Full:
+                pass
+
+    def _run(self):
+        while True:
+            batch = [self.events.get()]
+            # whatever arrived meanwhile is handled together
+            while True:
+                try:
+                    batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._hover_pending = False
+            if None in batch:
+                return
+
+            played_hover = False
+            for name in batch:
+                if name == "hover":
+                    if played_hover:
+                        self.merged += 1
+                        continue
+                    played_hover = True
+                try:
+                    self.backend.play(self.sounds[name])
+                except Exception:
+                    pass   # a missing sound device must never break the game
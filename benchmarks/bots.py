@@ -0,0 +1,350 @@
+"""
+Headless bot players for load testing.
+
+    python -m benchmarks.bots --bots 5000 --concurrency 500
+    python -m benchmarks.bots --levels EASY,RSA-512 --processes 4 --sink db
+    python -m benchmarks.bots --think 200 --json bots.json
+
+Each bot plays a full mission without a window, through the same
+mission.Mission the app drives: identity and difficulty, AUTO-GENERATE
+primes (from a KeyPool with --key-pool, as the app does), an e button or
+RANDOM e, encryption, the private-key check, the reveal, and the run the
+mission records. Bots run as asyncio tasks (optionally spread over
+several processes); --think adds a random human-like pause per stage.
+
+Leaderboard sinks:
+    service  JSON lines to leaderboard_service.py (start it first)
+    db       a LeaderboardStore per process, written directly
+    none     skip the write (engine load only)
+
+Reports missions per second and p50/p90/p99/max latency per stage. Runs
+the game itself would get wrong are counted, not failed: "garbled" when a
+CHAR-mode modulus is smaller than a character code (decryption cannot
+round-trip), "abandoned" when stage 2 offers no e to pick (tiny phi),
+"refused" when the mission turns a move down (e.g. TIME'S UP).
+Only unexpected exceptions make the exit code non-zero.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import rsa_engine
+from leaderboard_service import HOST, PORT
+from mission import Mission, MissionError
+
+STAGES = ["IDENTITY", "PRIMES", "KEYGEN", "ENCRYPT", "DECRYPT", "LEADERBOARD", "MISSION"]
+PERCENTILES = (50, 90, 99)
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz0123456789"
+
+# Share of bots that first type a pair the prime stage must reject.
+TYPO_RATE = 0.2
+
+# Share of bots on real key sizes that press RANDOM e instead of a listed e.
+RANDOM_E_RATE = 0.2
+
+
+class MissionAbandoned(Exception):
+    """The game left the player with no way forward."""
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+# ============================
+# LEADERBOARD SINKS
+# ============================
+class ServiceSink:
+    async def add(self, agent, time_spent, difficulty, splits):
+        reader, writer = await asyncio.open_connection(HOST, PORT)
+        try:
+            writer.write(json.dumps({"op": "add", "agent": agent, "time_spent": time_spent,
+                                     "difficulty": difficulty, "splits": splits}).encode() + b"\n")
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            if not reply.get("ok"):
+                raise ValueError(reply.get("error", "leaderboard service error"))
+        finally:
+            writer.close()
+
+    def close(self):
+        pass
+
+
+class DbSink:
+    def __init__(self, path):
+        from leaderboard import LeaderboardStore
+        self.store = LeaderboardStore(path)
+
+    async def add(self, agent, time_spent, difficulty, splits):
+        # blocking, like the game's direct fallback; SQLite serializes processes
+        self.store.add(agent, time_spent, difficulty, splits)
+
+    def close(self):
+        self.store.close()
+
+
+class NullSink:
+    async def add(self, agent, time_spent, difficulty, splits):
+        pass
+
+    def close(self):
+        pass
+
+
+class Outbox:
+    """Mission.leaderboard stand-in: keeps the run the mission records so the bot can send it."""
+
+    def __init__(self):
+        self.runs = []
+
+    def add(self, agent, time_spent, difficulty, splits=None):
+        self.runs.append((agent, time_spent, difficulty, splits))
+
+
+def make_sink(name, db_path):
+    if name == "service":
+        return ServiceSink()
+    if name == "db":
+        return DbSink(db_path)
+    return NullSink()
+
+
+# ============================
+# BOT
+# ============================
+class Bot:
+    def __init__(self, bot_id, level, sink, rng, think_s, message_len, key_pool=None):
+        self.agent = f"BOT-{bot_id:06d}"
+        self.level = level
+        self.sink = sink
+        self.rng = rng
+        self.think_s = think_s
+        self.message_len = message_len
+        self.key_pool = key_pool
+        self.outbox = Outbox()
+        self.mission = None
+        self.latency = {}
+
+    async def think(self):
+        if self.think_s:
+            await asyncio.sleep(self.rng.uniform(0, 2 * self.think_s))
+
+    async def stage(self, name, fn):
+        await self.think()
+        started = time.perf_counter()
+        result = fn()
+        if asyncio.iscoroutine(result):
+            result = await result
+        self.latency[name] = time.perf_counter() - started
+        return result
+
+    def start(self):
+        self.mission = Mission(self.agent, self.level, key_pool=self.key_pool, leaderboard=self.outbox)
+        self.mission.start()
+
+    def pick_primes(self):
+        """AUTO-GENERATE and VALIDATE, after an optional rejected attempt."""
+        mission = self.mission
+        if self.rng.random() < TYPO_RATE:
+            lo, hi = mission.prime_range
+            bad = self.rng.randrange(max(lo, 4), hi) // 2 * 2   # even, so never prime
+            try:
+                mission.submit_primes(bad, bad + 2)
+            except MissionError:
+                pass
+            else:
+                raise AssertionError(f"{self.level}: {bad}, {bad + 2} passed the prime checks")
+
+        p, q = mission.auto_primes()
+        try:
+            mission.submit_primes(p, q)
+        except MissionError as err:
+            raise AssertionError(f"{self.level}: generated {p}, {q} rejected: {err.args[1]}")
+
+    def pick_key(self):
+        """One of stage 2's e buttons (or RANDOM e), then on to encryption."""
+        mission = self.mission
+        if not mission.exponents:
+            raise MissionAbandoned("no e offered")
+        if self.level in rsa_engine.KEY_SIZE_TIERS and self.rng.random() < RANDOM_E_RATE:
+            key = mission.choose_e(None)
+        else:
+            key = mission.choose_e(self.rng.choice(mission.exponents))
+        mission.proceed()
+        return key
+
+    def unlock(self, typed_d):
+        """finish_game: the typed d must match before anything is revealed."""
+        self.mission.unlock(typed_d)
+        return "".join(self.mission.reveal())
+
+    async def run(self):
+        mission_started = time.perf_counter()
+
+        await self.stage("IDENTITY", self.start)
+        await self.stage("PRIMES", self.pick_primes)
+        key = await self.stage("KEYGEN", self.pick_key)
+
+        message = "".join(self.rng.choice(ALPHABET) for _ in range(self.message_len))
+        mode = rsa_engine.MODE_BLOCK if rsa_engine.supports_block_mode(key.n) else rsa_engine.MODE_CHAR
+        await self.stage("ENCRYPT", lambda: self.mission.encrypt(message, mode))
+        plain = await self.stage("DECRYPT", lambda: self.unlock(key.d))
+
+        await self.stage("LEADERBOARD", lambda: self.sink.add(*self.outbox.runs[0]))
+        self.latency["MISSION"] = time.perf_counter() - mission_started
+        return self.latency, "completed" if plain == message else "garbled"
+
+
+# ============================
+# DRIVER
+# ============================
+async def run_bots(first_id, count, concurrency, levels, sink_name, db_path, seed, think_s,
+                   message_len, use_key_pool=False):
+    """Run `count` bots, at most `concurrency` at once. Returns (latencies, outcomes, errors)."""
+    sink = make_sink(sink_name, db_path)
+    key_pool = None
+    if use_key_pool:
+        from key_pool import KeyPool
+        key_pool = KeyPool({lvl: rsa_engine.level_ranges()[lvl] for lvl in levels}).start()
+    rng = random.Random(seed)
+    gate = asyncio.Semaphore(concurrency)
+    latencies = {stage: [] for stage in STAGES}
+    outcomes, errors = {}, {}
+
+    async def one(bot_id):
+        level = rng.choice(levels)
+        bot = Bot(bot_id, level, sink, random.Random(rng.random()), think_s, message_len, key_pool)
+        async with gate:
+            try:
+                result, outcome = await bot.run()
+            except MissionAbandoned as err:
+                key = f"abandoned ({level}: {err})"
+                outcomes[key] = outcomes.get(key, 0) + 1
+                return
+            except MissionError as err:   # the game refused a move, e.g. TIME'S UP
+                key = f"refused ({level}: {err.args[0]})"
+                outcomes[key] = outcomes.get(key, 0) + 1
+                return
+            except Exception as err:   # count, keep the other bots going
+                key = f"{type(err).__name__}: {err}"
+                errors[key] = errors.get(key, 0) + 1
+                return
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        for stage, seconds in result.items():
+            latencies[stage].append(seconds)
+
+    try:
+        await asyncio.gather(*(one(first_id + i) for i in range(count)))
+    finally:
+        sink.close()
+        if key_pool is not None:
+            key_pool.close()
+    return latencies, outcomes, errors
+
+
+def run_worker(args):
+    return asyncio.run(run_bots(*args))
+
+
+def report(latencies, outcomes, errors, wall_s):
+    missions = len(latencies["MISSION"])
+    result = {
+        "missions": missions,
+        "failed": sum(errors.values()),
+        "outcomes": outcomes,
+        "wall_s": round(wall_s, 3),
+        "missions_per_s": round(missions / wall_s, 2) if wall_s else 0.0,
+        "errors": errors,
+        "stages": {},
+    }
+    for stage in STAGES:
+        values = sorted(latencies[stage])
+        row = {f"p{pct}_ms": round(percentile(values, pct) * 1000, 3) for pct in PERCENTILES}
+        row["max_ms"] = round(values[-1] * 1000, 3) if values else 0.0
+        row["count"] = len(values)
+        result["stages"][stage] = row
+    return result
+
+
+def print_report(result):
+    print(f"\n{result['missions']} missions in {result['wall_s']:.2f} s "
+          f"→ {result['missions_per_s']:.1f} missions/s, {result['failed']} failed")
+    print(f"{'stage':<12}" + "".join(f"{'p' + str(p) + ' ms':>12}" for p in PERCENTILES) + f"{'max ms':>12}")
+    for stage, row in result["stages"].items():
+        print(f"{stage:<12}" + "".join(f"{row[f'p{p}_ms']:>12.3f}" for p in PERCENTILES)
+              + f"{row['max_ms']:>12.3f}")
+    for outcome, count in sorted(result["outcomes"].items()):
+        print(f"  {count} × {outcome}")
+    for err, count in result["errors"].items():
+        print(f"  {count} × {err}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSA Vault headless bot load driver")
+    parser.add_argument("--bots", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200, help="bots in flight per process")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--levels", default=",".join(rsa_engine.DIFFICULTY_RANGES),
+                        help="comma-separated levels, e.g. EASY,HARD,RSA-512")
+    parser.add_argument("--sink", choices=["service", "db", "none"], default="none")
+    parser.add_argument("--db", default="bots_leaderboard.db", help="database for --sink db")
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause per stage, ms")
+    parser.add_argument("--message-len", type=int, default=32)
+    parser.add_argument("--key-pool", action="store_true",
+                        help="AUTO-GENERATE from a background KeyPool, like the app")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    levels = [lvl.strip() for lvl in args.levels.split(",") if lvl.strip()]
+    unknown = set(levels) - set(rsa_engine.level_ranges())
+    if unknown:
+        parser.error(f"unknown level(s): {', '.join(sorted(unknown))}")
+
+    processes = max(1, min(args.processes, args.bots))
+    shares = [args.bots // processes + (i < args.bots % processes) for i in range(processes)]
+    jobs, first = [], 0
+    for i, share in enumerate(shares):
+        jobs.append((first, share, args.concurrency, levels, args.sink, args.db,
+                     args.seed + i, args.think / 1000, args.message_len, args.key_pool))
+        first += share
+
+    started = time.perf_counter()
+    if processes == 1:
+        results = [run_worker(jobs[0])]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(run_worker, jobs))
+    wall_s = time.perf_counter() - started
+
+    latencies = {stage: [] for stage in STAGES}
+    outcomes, errors = {}, {}
+    for lat, outs, errs in results:
+        for stage, values in lat.items():
+            latencies[stage].extend(values)
+        for merged, part in ((outcomes, outs), (errors, errs)):
+            for key, count in part.items():
+                merged[key] = merged.get(key, 0) + count
+
+    result = report(latencies, outcomes, errors, wall_s)
+    result["config"] = {k: v for k, v in vars(args).items() if k != "json"}
+    print_report(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=1)
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+CRT vs plain decryption benchmark.
+
+    python -m benchmarks.crt [--messages 20] [--length 64]
+
+Decrypts the same ciphertexts with pow(c, d, n) and with the CRT path for
+each key size and prints ops/s plus the speed-up.
+"""
+import argparse
+import random
+import time
+
+import rsa_engine
+
+KEY_SIZES = [512, 1024, 2048, 3072]
+
+
+def time_it(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--length", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz0123456789"
+    messages = [
+        "".join(rng.choice(alphabet) for _ in range(args.length))
+        for _ in range(args.messages)
+    ]
+    ops = args.messages * args.length
+
+    print(f"{'bits':>6} {'plain ops/s':>14} {'crt ops/s':>14} {'speed-up':>9}")
+    for bits in KEY_SIZES:
+        key = rsa_engine.keygen_bits(bits, rng=rng)
+        ciphers = rsa_engine.encrypt_many(messages, key)
+
+        plain_t, plain = time_it(rsa_engine.decrypt_many, ciphers, key, False, rsa_engine.MODE_CHAR, False)
+        crt_t, crt = time_it(rsa_engine.decrypt_many, ciphers, key, True, rsa_engine.MODE_CHAR, False)
+        assert plain == crt == messages
+
+        print(f"{bits:>6} {ops / plain_t:>14.0f} {ops / crt_t:>14.0f} {plain_t / crt_t:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Crypto micro-benchmark suite.
+
+    python -m benchmarks.suite                      # quick run, compare to baseline
+    python -m benchmarks.suite --full               # adds RSA-4096 and 1 MB / 10 MB messages
+    python -m benchmarks.suite --save-baseline      # record this machine's numbers
+    python -m benchmarks.suite --only encrypt       # cases whose name contains "encrypt"
+
+Covers the engine paths behind the game: primality (is_prime), AUTO-GENERATE
+(random_prime_pair), the e search of stage_2_keygen (public_exponents),
+calc_d's modular inverse (private_exponent) and encrypt / decrypt
+throughput, for every difficulty tier plus larger key sizes.
+
+Results are written as JSON. When a baseline exists, any case slower than
+baseline * (1 + tolerance) is listed and the exit code is 1. Baselines are
+machine specific: record one per machine with --save-baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+import rsa_engine
+from mission import E_CHOICES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+QUICK_KEY_SIZES = [3072]
+FULL_KEY_SIZES = [3072, 4096]
+QUICK_SIZES = [1, 1024, 64 * 1024]
+FULL_SIZES = QUICK_SIZES + [1024 * 1024, 10 * 1024 * 1024]
+
+# Block decryption costs one full CRT exponentiation per block, so huge
+# messages are only decrypted up to this many blocks per case.
+MAX_DECRYPT_BLOCKS = 512
+
+# A case whose single run takes longer than this is not repeated.
+SLOW_CASE_S = 1.0
+BATCH_S = 0.01
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz0123456789.,"
+
+
+# ============================
+# TIMING
+# ============================
+def _batch(fn, number):
+    t0 = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - t0
+
+
+def measure(fn, min_time=0.2, max_runs=50, min_runs=3):
+    """
+    Median seconds per call of fn(). Fast functions are called in batches
+    of at least BATCH_S so timer resolution does not dominate.
+    """
+    number = 1
+    first = _batch(fn, 1)
+    while first * number < BATCH_S:
+        number *= 10
+    times = [first] if number == 1 else []
+
+    start = time.perf_counter()
+    while len(times) < max_runs:
+        times.append(_batch(fn, number) / number)
+        if time.perf_counter() - start >= min_time and (
+                len(times) >= min_runs or times[-1] >= SLOW_CASE_S):
+            break
+    return statistics.median(times)
+
+
+# ============================
+# TIERS
+# ============================
+def build_tiers(rng, extra_sizes):
+    """tier name -> (prime_range, level, key)"""
+    tiers = {}
+    for level, prime_range in rsa_engine.DIFFICULTY_RANGES.items():
+        primes = rsa_engine.primes_in_range(*prime_range)
+        key = rsa_engine.keygen(primes[-1], primes[-2])
+        tiers[level] = (prime_range, level, key)
+
+    sizes = dict(rsa_engine.KEY_SIZE_TIERS)
+    for bits in extra_sizes:
+        sizes[f"RSA-{bits}"] = bits
+    for name, bits in sizes.items():
+        prime_range = rsa_engine.prime_range_for_bits(bits)
+        tiers[name] = (prime_range, None, rsa_engine.keygen(prime_range=prime_range, rng=rng))
+    return tiers
+
+
+def message(size, rng):
+    return "".join(rng.choice(ALPHABET) for _ in range(min(size, 4096))) * (size // 4096 + 1)
+
+
+# ============================
+# CASES
+# ============================
+def run_cases(tiers, sizes, rng, only=None, min_time=0.2):
+    results = {}
+
+    def wanted(name):
+        return not only or only in name
+
+    def case(name, fn, **extra):
+        if not wanted(name):
+            return
+        seconds = measure(fn, min_time=min_time)
+        results[name] = {"seconds": seconds, "per_sec": 1 / seconds if seconds else None, **extra}
+        print(f"{name:<48} {seconds * 1000:>12.3f} ms", flush=True)
+
+    for tier, (prime_range, level, key) in tiers.items():
+        lo, hi = prime_range
+
+        if level:
+            case(f"is_prime/{tier}/range", lambda: [rsa_engine.is_prime(n) for n in range(lo, hi)],
+                 ops=hi - lo)
+        else:
+            case(f"is_prime/{tier}/prime", lambda: rsa_engine.is_prime(key.p))
+
+        case(f"auto_gen_primes/{tier}",
+             lambda: rsa_engine.random_prime_pair(prime_range, rng, level=level))
+        case(f"e_search/{tier}", lambda: rsa_engine.public_exponents(key.phi, E_CHOICES))
+        case(f"calc_d/{tier}", lambda: rsa_engine.private_exponent(key.e, key.phi))
+
+        for mode in rsa_engine.MODES:
+            if mode == rsa_engine.MODE_BLOCK and not rsa_engine.supports_block_mode(key.n):
+                continue
+            for size in sizes:
+                msg = message(size, rng)[:size]
+
+                def enc():
+                    rsa_engine.CODEBOOKS.clear()
+                    rsa_engine.encrypt(msg, key.e, key.n, mode)
+
+                case(f"encrypt/{tier}/{mode}/{size}B", enc, bytes=size)
+
+                name = f"decrypt/{tier}/{mode}/{size}B"
+                if not wanted(name):
+                    continue
+                if (mode == rsa_engine.MODE_BLOCK and
+                        len(msg.encode()) > MAX_DECRYPT_BLOCKS * rsa_engine.block_payload_size(key.n)):
+                    continue
+                # CHAR goes through the codebook, so repeated characters share
+                # one int object: 10 MB of text is ~80 MB of list, not gigabytes
+                cipher = rsa_engine.encrypt(msg, key.e, key.n, mode)
+                rsa_engine.CODEBOOKS.clear()
+
+                def dec():
+                    rsa_engine.CODEBOOKS.clear()
+                    rsa_engine.decrypt_crt(cipher, key, mode)
+
+                case(name, dec, bytes=size)
+
+    return results
+
+
+# ============================
+# BASELINE
+# ============================
+def compare(results, baseline, tolerance, only=None):
+    """
+    (regressions, matched, missing): [(case, baseline_s, current_s)] for
+    every case slower than allowed, how many cases both runs have, and the
+    baseline cases (within `only`) this run did not measure.
+    """
+    base_results = baseline.get("results", {})
+    regressions = []
+    matched = 0
+    for name, res in results.items():
+        base = base_results.get(name)
+        if not base:
+            continue
+        matched += 1
+        if res["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append((name, base["seconds"], res["seconds"]))
+    missing = sorted(name for name in base_results
+                     if name not in results and (not only or only in name))
+    return regressions, matched, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSA Vault crypto benchmarks")
+    parser.add_argument("--full", action="store_true", help="add RSA-4096 and 1 MB / 10 MB messages")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=20254)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    tiers = build_tiers(rng, FULL_KEY_SIZES if args.full else QUICK_KEY_SIZES)
+    sizes = FULL_SIZES if args.full else QUICK_SIZES
+
+    results = run_cases(tiers, sizes, rng, args.only, args.min_time)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.time(),
+            "full": args.full,
+        },
+        "results": results,
+    }
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"\nResults written to {args.out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions, matched, missing = compare(results, baseline, args.tolerance, args.only)
+    if missing:
+        print(f"\nWARNING: {len(missing)} baseline case(s) not measured in this run:", file=sys.stderr)
+        for name in missing:
+            print(f"  {name}", file=sys.stderr)
+    if not matched:
+        print(f"\nNo case of this run is in the baseline at {args.baseline}; nothing was compared "
+              "(different --full / --only, or renamed cases?).", file=sys.stderr)
+        return 1
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSIONS (> {args.tolerance:.0%} slower than baseline):", file=sys.stderr)
+        for name, base, now in regressions:
+            print(f"  {name:<48} {base * 1000:>10.3f} ms -> {now * 1000:>10.3f} ms "
+                  f"({now / base:.2f}x)", file=sys.stderr)
+        return 1
+
+    print(f"No regressions against baseline ({matched} cases compared).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
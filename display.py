@@ -0,0 +1,90 @@
+"""
+DISPLAY
+Compact, bounded-cost text for big numbers and long ciphertexts.
+
+int -> decimal str is quadratic in CPython (and refused past
+sys.get_int_max_str_digits()), so numbers can be shown as hex or base64,
+which are linear, and anything long is truncated in the middle. Long
+ciphertexts are produced as a stream of text chunks that the UI inserts a
+few at a time instead of building one giant string.
+"""
+import base64
+
+DEC, HEX, B64 = "DEC", "HEX", "B64"
+DISPLAY_MODES = (DEC, HEX, B64)
+
+# Numbers longer than this are never converted to decimal (hex instead).
+DEC_MAX_BITS = 8192
+
+# Text handed to the widget per insert, and the most an expanded view holds.
+CHUNK_CHARS = 4096
+MAX_VIEW_CHARS = 2_000_000
+
+# Collapsed ciphertext: first / last numbers shown, each cut to this length.
+HEAD_VALUES = 48
+TAIL_VALUES = 8
+VALUE_PREVIEW_CHARS = 40
+
+ELLIPSIS = "…"
+
+
+def next_mode(mode):
+    return DISPLAY_MODES[(DISPLAY_MODES.index(mode) + 1) % len(DISPLAY_MODES)]
+
+
+def format_int(value, mode=DEC):
+    """value as DEC, HEX ('0x…') or B64 (big-endian bytes) text."""
+    if mode == B64:
+        return base64.b64encode(value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")).decode()
+    if mode == HEX or value.bit_length() > DEC_MAX_BITS:
+        return f"0x{value:x}"
+    return str(value)
+
+
+def parse_int(text):
+    """Parse what a player types: decimal, or hex with a 0x prefix."""
+    text = text.strip().replace(" ", "")
+    if text[:2].lower() == "0x":
+        return int(text[2:], 16)
+    return int(text)
+
+
+def truncate_middle(text, limit):
+    """text cut to about `limit` characters, keeping both ends."""
+    if len(text) <= limit:
+        return text
+    keep = max(2, limit - 1)
+    head = (keep + 1) // 2
+    return f"{text[:head]}{ELLIPSIS}{text[len(text) - (keep - head):]}"
+
+
+def collapsed(count):
+    """(head_end, tail_start) when `count` values are too many to show, else None."""
+    if count <= HEAD_VALUES + TAIL_VALUES:
+        return None
+    return HEAD_VALUES, count - TAIL_VALUES
+
+
+def cipher_chunks(values, mode=DEC, sep=", ", value_limit=None, max_chars=MAX_VIEW_CHARS):
+    """
+    Yield the joined text of `values` in pieces of about CHUNK_CHARS.
+    value_limit truncates every number; output stops after max_chars with
+    a note of how many numbers were left out.
+    """
+    parts, size, total = [], 0, 0
+    for i, value in enumerate(values):
+        text = format_int(value, mode)
+        if value_limit:
+            text = truncate_middle(text, value_limit)
+        piece = text if i == 0 else sep + text
+        if total + size + len(piece) > max_chars:
+            parts.append(f"{sep}{ELLIPSIS} ({len(values) - i:,} more numbers not shown)")
+            break
+        parts.append(piece)
+        size += len(piece)
+        if size >= CHUNK_CHARS:
+            yield "".join(parts)
+            total += size
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts)
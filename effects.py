@@ -0,0 +1,99 @@
+"""
+CANVAS EFFECTS
+Welcome-screen backdrop and sweep dividers drawn as tk.Canvas items.
+
+Moving canvas items only repaints the canvas; moving widgets with place()
+runs the geometry manager on every step. Particles are split into a few
+drift groups that move together by tag, so one frame costs the same few
+Tcl calls whether there are 12 particles or 500.
+"""
+import random
+import tkinter as tk
+
+DRIFT_GROUPS = 8
+WRAP_EVERY = 30     # frames between off-screen checks
+
+
+class Backdrop:
+    """Full-window canvas with floating particles and a moving scan line."""
+
+    def __init__(self, parent, bg, particle_color, scan_color,
+                 particle_count=12, width=1100, height=650, scan_y=140):
+        self.canvas = tk.Canvas(parent, bg=bg, highlightthickness=0, bd=0)
+        self.canvas.place(x=0, y=0, relwidth=1, relheight=1)
+        self.width = width
+        self.height = height
+        self.frame = 0
+
+        self.particle_color = particle_color
+        self.particles = 0
+
+        self.scan = self.canvas.create_line(0, scan_y, 300, scan_y, fill=scan_color, width=2)
+        self.add_particles(particle_count)
+
+    def add_particles(self, count):
+        """Scatter `count` more particles (callers may defer this past the first paint)."""
+        for i in range(self.particles, self.particles + count):
+            x, y = random.uniform(0, self.width), random.uniform(0, self.height)
+            self.canvas.create_oval(
+                x, y, x + 3, y + 3,
+                fill=self.particle_color, outline="",
+                tags=("particle", f"drift{i % DRIFT_GROUPS}")
+            )
+        self.particles += count
+
+    def step_scan(self, dx=12):
+        self.canvas.move(self.scan, dx, 0)
+        x0 = self.canvas.coords(self.scan)[0]
+        limit = max(1, self.canvas.winfo_width())
+        if x0 >= limit:
+            self.canvas.move(self.scan, -x0, 0)
+
+    def step_particles(self, speed=0.4):
+        for g in range(DRIFT_GROUPS):
+            self.canvas.move(
+                f"drift{g}",
+                random.choice([-2, -1, 1, 2]) * speed,
+                random.choice([-1, 1]) * speed
+            )
+
+        self.frame += 1
+        if self.frame % WRAP_EVERY == 0:
+            self._wrap_particles()
+
+    def _wrap_particles(self):
+        for item in self.canvas.find_withtag("particle"):
+            x, y = self.canvas.coords(item)[:2]
+            if 0 <= x < self.width and 0 <= y < self.height:
+                continue
+            self.canvas.move(item, (x % self.width) - x, (y % self.height) - y)
+
+
+class SweepDivider:
+    """A glowing bar that sweeps back and forth along a thin track."""
+
+    def __init__(self, parent, track_color, width=450, height=3, bar_width=120):
+        self.canvas = tk.Canvas(parent, bg=track_color, width=width, height=height,
+                                highlightthickness=0, bd=0)
+        self.bar = self.canvas.create_rectangle(0, 0, bar_width, height, outline="")
+        self.span = width - bar_width
+        self.x = 0
+        self.direction = 1
+
+    def pack(self, **kw):
+        self.canvas.pack(**kw)
+        return self
+
+    def step(self, dx=8):
+        new_x = self.x + dx * self.direction
+        if new_x > self.span:
+            self.direction = -1
+        elif new_x < 0:
+            self.direction = 1
+
+        self.canvas.move(self.bar, new_x - self.x, 0)
+        self.x = new_x
+
+        # Subtle breathing brightness effect
+        brightness = 200 + int(20 * abs(self.x / self.span))
+        self.canvas.itemconfig(self.bar, fill=f"#00{min(brightness, 255):02x}66")
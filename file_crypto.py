@@ -0,0 +1,170 @@
+"""
+FILE ENCRYPTION
+Streaming RSA encryption / decryption of whole files in BLOCK mode.
+
+Input is read in fixed-size buffers and every buffer goes through a
+generator pipeline (read -> pack -> pow -> write), so memory stays flat no
+matter how large the file is.
+
+Command line:
+    python file_crypto.py keygen --bits 2048 key.json
+    python file_crypto.py encrypt key.json secret.pdf secret.pdf.rsav
+    python file_crypto.py decrypt key.json secret.pdf.rsav secret.pdf
+"""
+import argparse
+import json
+import os
+import sys
+
+import rsa_engine
+
+MAGIC = b"RSAVF001"
+
+# Blocks handled per buffer; one buffer is one unit of work for the pool.
+BLOCKS_PER_CHUNK = 1024
+
+
+class Cancelled(Exception):
+    """Raise from a progress callback to stop a job; the partial output is removed."""
+
+
+def cipher_width(n):
+    """Bytes used to store one ciphertext block (every c < n fits)."""
+    return (n.bit_length() + 7) // 8
+
+
+# ============================
+# KEY FILES
+# ============================
+def save_key(key, path):
+    with open(path, "w") as f:
+        json.dump(rsa_engine.key_to_dict(key), f)
+
+
+def load_key(path):
+    with open(path) as f:
+        return rsa_engine.key_from_dict(json.load(f))
+
+
+# ============================
+# PIPELINE STAGES
+# ============================
+def read_chunks(f, chunk_size):
+    """Yield successive chunk_size pieces of an open binary file."""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def encrypt_chunks(chunks, key, workers=None):
+    """Plaintext buffers -> serialized ciphertext buffers."""
+    width = cipher_width(key.n)
+    for chunk in chunks:
+        blocks = rsa_engine.pack_bytes(chunk, key.n)
+        cipher = rsa_engine.parallel_map(rsa_engine.pow_chunk, blocks, (key.e, key.n), workers)
+        yield len(chunk), b"".join(c.to_bytes(width, "big") for c in cipher)
+
+
+def decrypt_chunks(chunks, key, workers=None):
+    """Serialized ciphertext buffers -> plaintext buffers."""
+    width = cipher_width(key.n)
+    for chunk in chunks:
+        if len(chunk) % width:
+            raise ValueError("Ciphertext is truncated or was made with another key.")
+        cipher = [int.from_bytes(chunk[i:i + width], "big") for i in range(0, len(chunk), width)]
+        blocks = rsa_engine.parallel_map(rsa_engine.crt_chunk, cipher, (key,), workers)
+        yield len(chunk), rsa_engine.unpack_bytes(blocks)
+
+
+def _run(src, dst, stage, key, chunk_size, header, progress, workers):
+    try:
+        return _run_pipeline(src, dst, stage, key, chunk_size, header, progress, workers)
+    except Cancelled:
+        os.remove(dst)
+        raise
+
+
+def _run_pipeline(src, dst, stage, key, chunk_size, header, progress, workers):
+    total = os.path.getsize(src)
+    done = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        if header is None:
+            fout.write(MAGIC + cipher_width(key.n).to_bytes(4, "big"))
+        else:
+            head = fin.read(len(MAGIC) + 4)
+            done = len(head)
+            if head[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{src} is not an RSA Vault file.")
+            if int.from_bytes(head[len(MAGIC):], "big") != header:
+                raise ValueError("This file was encrypted with a different key size.")
+
+        for consumed, out in stage(read_chunks(fin, chunk_size), key, workers):
+            fout.write(out)
+            done += consumed
+            if progress:
+                progress(done, total)
+    return total
+
+
+# ============================
+# PUBLIC API
+# ============================
+def encrypt_file(src, dst, key, progress=None, workers=None):
+    """
+    Encrypt src into dst. progress(done_bytes, total_bytes) is called after
+    every buffer and may raise Cancelled. Returns the number of input bytes.
+    """
+    size = rsa_engine.block_payload_size(key.n)
+    if size < 1:
+        raise ValueError(f"n = {key.n} is too small for file encryption (needs n >= 65536).")
+    return _run(src, dst, encrypt_chunks, key, size * BLOCKS_PER_CHUNK, None, progress, workers)
+
+
+def decrypt_file(src, dst, key, progress=None, workers=None):
+    """Inverse of encrypt_file."""
+    width = cipher_width(key.n)
+    return _run(src, dst, decrypt_chunks, key, width * BLOCKS_PER_CHUNK, width, progress, workers)
+
+
+# ============================
+# COMMAND LINE
+# ============================
+def _print_progress(done, total):
+    pct = 100 * done / total if total else 100
+    print(f"\r{done}/{total} bytes ({pct:5.1f}%)", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream-encrypt files with RSA Vault keys.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    kg = sub.add_parser("keygen", help="create a key file")
+    kg.add_argument("--bits", type=int, default=2048)
+    kg.add_argument("key")
+
+    for name in ("encrypt", "decrypt"):
+        cmd = sub.add_parser(name, help=f"{name} a file")
+        cmd.add_argument("key")
+        cmd.add_argument("src")
+        cmd.add_argument("dst")
+        cmd.add_argument("--workers", type=int, default=None)
+        cmd.add_argument("--quiet", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "keygen":
+        save_key(rsa_engine.keygen_bits(args.bits), args.key)
+        return 0
+
+    key = load_key(args.key)
+    run = encrypt_file if args.command == "encrypt" else decrypt_file
+    run(args.src, args.dst, key, None if args.quiet else _print_progress, args.workers)
+    if not args.quiet:
+        print(file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+GAME SERVER
+Many RSA Vault missions in one local process, for classroom events.
+
+Each session is a mission.Mission; clients (the Tk app started with
+--server, or anything that speaks the protocol) only draw screens and send
+the player's moves. The event loop runs on one core and never does key
+work itself: prime checks, key derivation, encryption and decryption go to
+a pool of worker processes, while a KeyPool keeps AUTO-GENERATE instant.
+Finished runs go into an in-process LeaderboardService (batched writes).
+
+Protocol: one JSON object per line over localhost TCP, one persistent
+connection per client. Every reply has "ok"; refusals carry
+"error": [title, message].
+    {"op": "new", "agent": "Bond", "level": "EASY"}      -> {"session": "…", "state": {…}}
+    {"op": "auto_primes", "session": "…"}                 -> {"p": 5, "q": 7}
+    {"op": "primes", "session": "…", "p": 5, "q": 7}      -> {"n": …, "phi": …, "exponents": […]}
+    {"op": "choose_e", "session": "…", "e": 5}            -> {"p": …, "q": …, "e": …, "d": …}   (e null = RANDOM e)
+    {"op": "proceed", "session": "…"}
+    {"op": "encrypt", "session": "…", "message": "hi", "mode": "CHAR"} -> {"cipher": […]}
+    {"op": "unlock", "session": "…", "d": 29}             -> {"time_spent": …, "splits": {…}}
+    {"op": "reveal", "session": "…"}                      -> {"text": "…", "done": false}
+    {"op": "state" | "end", "session": "…"}
+    {"op": "top" | "page" | "count", …}                   (as leaderboard_service.py)
+
+Run it with:
+    python game_server.py [--port 8766] [--workers 4] [--db leaderboard.db]
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import mission
+import rsa_engine
+from key_pool import KeyPool
+from leaderboard import TOP_K, LeaderboardStore
+from leaderboard_service import LeaderboardService
+from mission import Mission, MissionError
+
+HOST = "127.0.0.1"
+PORT = 8766
+
+SESSION_IDLE_S = 15 * 60     # sessions untouched this long are dropped
+REAP_INTERVAL = 30
+
+
+class Session:
+    __slots__ = ("mission", "last_seen", "stream", "prefetch")
+
+    def __init__(self, mission):
+        self.mission = mission
+        self.last_seen = time.monotonic()
+        self.stream = None     # DecryptStream once revealed
+        self.prefetch = None   # task decrypting the next reveal chunk
+
+
+# ============================
+# SERVER
+# ============================
+class GameServer:
+    def __init__(self, store, workers=None, key_pool=None):
+        self.leaderboard = LeaderboardService(store)
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self.key_pool = key_pool
+        self.sessions = {}
+
+    async def run(self, fn, *args):
+        """fn(*args) in a worker process, so the loop keeps serving everyone else."""
+        return await asyncio.get_running_loop().run_in_executor(self.pool, partial(fn, *args))
+
+    def session(self, req):
+        session = self.sessions.get(req.get("session"))
+        if session is None:
+            raise MissionError("ERROR", "Unknown or expired session.")
+        session.last_seen = time.monotonic()
+        return session
+
+    async def reap_loop(self):
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            cutoff = time.monotonic() - SESSION_IDLE_S
+            for sid in [sid for sid, s in self.sessions.items() if s.last_seen < cutoff]:
+                self.drop(sid)
+
+    def drop(self, sid):
+        session = self.sessions.pop(sid, None)
+        if session and session.prefetch:
+            session.prefetch.cancel()
+
+    # ============================
+    # CONNECTIONS
+    # ============================
+    async def handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    reply = await self.dispatch(json.loads(line))
+                except MissionError as err:
+                    reply = {"ok": False, "error": list(err.args)}
+                except (ValueError, KeyError, TypeError, sqlite3.Error) as err:
+                    reply = {"ok": False, "error": ["ERROR", str(err)]}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, req):
+        op = req["op"]
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            raise ValueError(f"unknown op {op!r}")
+        return {"ok": True, **(await handler(req) or {})}
+
+    # ============================
+    # MISSION OPS
+    # ============================
+    async def op_new(self, req):
+        m = Mission(req.get("agent"), req.get("level"), key_pool=self.key_pool,
+                    leaderboard=self.leaderboard)
+        m.start()
+        sid = secrets.token_hex(8)
+        self.sessions[sid] = Session(m)
+        return {"session": sid, "state": m.state()}
+
+    async def op_state(self, req):
+        return {"state": self.session(req).mission.state()}
+
+    async def op_end(self, req):
+        self.drop(req.get("session"))
+
+    async def op_auto_primes(self, req):
+        m = self.session(req).mission
+        pair = m.take_bundle()
+        if pair is None:
+            pair = await self.run(mission.job_random_primes, m.level, m.prime_range)
+        return {"p": pair[0], "q": pair[1]}
+
+    async def op_primes(self, req):
+        m = self.session(req).mission
+        p, q = int(req["p"]), int(req["q"])
+        m.expect(mission.PRIMES)
+        checked = m.bundle_check(p, q) or await self.run(
+            mission.job_check_primes, p, q, m.level, m.prime_range)
+        m.expect(mission.PRIMES)   # the clock may have run out meanwhile
+        return m.apply_primes(p, q, checked)
+
+    async def op_choose_e(self, req):
+        m = self.session(req).mission
+        e = m.resolve_e(None if req.get("e") is None else int(req["e"]))
+        key = m.bundle_key(e)
+        if key is None:
+            try:
+                key = await self.run(mission.job_key, m.p, m.q, e)
+            except ValueError as err:
+                raise MissionError("ERROR", str(err))
+        m.expect(mission.KEYGEN)
+        m.apply_key(key)
+        return {"p": key.p, "q": key.q, "e": key.e, "d": key.d}
+
+    async def op_proceed(self, req):
+        self.session(req).mission.proceed()
+
+    async def op_encrypt(self, req):
+        m = self.session(req).mission
+        message, mode = str(req.get("message", "")), req.get("mode", rsa_engine.MODE_CHAR)
+        m.check_message(message, mode)
+        cipher = await self.run(mission.job_encrypt, message, m.key.e, m.key.n, mode)
+        m.expect(mission.ENCRYPT)
+        return {"cipher": m.apply_cipher(cipher, mode)}
+
+    async def op_unlock(self, req):
+        return self.session(req).mission.unlock(int(req["d"]))
+
+    async def op_reveal(self, req):
+        """The next chunk of plaintext; the one after it is decrypted meanwhile."""
+        session = self.session(req)
+        if session.stream is None:
+            session.stream = session.mission.reveal()
+            session.prefetch = self.decrypt_next(session.stream)
+        stream = session.stream
+        text = await session.prefetch if session.prefetch else ""
+        session.prefetch = self.decrypt_next(stream)
+        return {"text": text, "done": session.prefetch is None}
+
+    def decrypt_next(self, stream):
+        if stream.done:
+            return None
+        chunk, last = stream.take()
+
+        async def job():
+            values = await self.run(rsa_engine.decrypt_chunk, chunk, stream.key, stream.mode)
+            return stream.decode(values, last)
+        return asyncio.ensure_future(job())
+
+    # ============================
+    # LEADERBOARD OPS
+    # ============================
+    async def op_top(self, req):
+        return {"rows": self.leaderboard.top(int(req.get("limit", TOP_K)), req.get("difficulty"))}
+
+    async def op_page(self, req):
+        return self.leaderboard.dispatch(req)
+
+    async def op_count(self, req):
+        return self.leaderboard.dispatch(req)
+
+    async def op_ping(self, req):
+        return {"sessions": len(self.sessions)}
+
+
+async def serve(store, host=HOST, port=PORT, workers=None, key_pool=None):
+    game = GameServer(store, workers, key_pool)
+    server = await asyncio.start_server(game.handle, host, port)
+    tasks = [asyncio.create_task(game.leaderboard.flush_loop()),
+             asyncio.create_task(game.reap_loop())]
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for task in tasks:
+            task.cancel()
+        game.pool.shutdown(wait=False, cancel_futures=True)
+        game.leaderboard.flush()
+
+
+# ============================
+# CLIENT
+# ============================
+class GameClient:
+    """
+    Blocking client for one player (the Tk app with --server). Offers the
+    same new_mission() as mission.LocalGame and the leaderboard reads of
+    LeaderboardStore, so the app does not care where missions run.
+    """
+
+    def __init__(self, host=HOST, port=PORT, timeout=30):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.reader = self.sock.makefile("rb")
+
+    def request(self, op, **fields):
+        self.sock.sendall(json.dumps({"op": op, **fields}).encode() + b"\n")
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("game server closed the connection")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise MissionError(*reply.get("error", ["ERROR", "game server error"]))
+        return reply
+
+    def new_mission(self, agent, level):
+        return RemoteMission(self, agent, level)
+
+    def close(self):
+        self.sock.close()
+
+    # leaderboard reads (writes happen on the server when a mission is unlocked);
+    # failures are OSError, as from LeaderboardClient
+    def read(self, op, **fields):
+        try:
+            return self.request(op, **fields)
+        except MissionError as err:
+            raise OSError(err.args[-1]) from err
+
+    def top(self, limit=TOP_K, difficulty=None):
+        return [tuple(r) for r in self.read("top", limit=limit, difficulty=difficulty)["rows"]]
+
+    def page(self, offset=0, limit=50, difficulty=None, search=None):
+        return [tuple(r) for r in self.read("page", offset=offset, limit=limit,
+                                            difficulty=difficulty, search=search)["rows"]]
+
+    def count(self, difficulty=None, search=None):
+        return self.read("count", difficulty=difficulty, search=search)["count"]
+
+
+class RemoteMission:
+    """mission.Mission's interface, played on the server. The clock here only mirrors it for display."""
+
+    def __init__(self, client, agent, level):
+        self.client = client
+        self.agent, self.level = agent, level
+        self.clock = mission.MissionClock(mission.MISSION_SECONDS)
+        self.session = None
+        self.p = self.q = self.n = self.phi = None
+        self.exponents = ()
+        self.key = None
+        self.cipher = None
+        self.mode = rsa_engine.MODE_CHAR
+
+    def call(self, op, **fields):
+        return self.client.request(op, session=self.session, **fields)
+
+    def start(self):
+        reply = self.client.request("new", agent=self.agent, level=self.level)
+        self.session = reply["session"]
+        self.prime_range = tuple(reply["state"]["prime_range"])
+        self.clock.start(mission.PRIMES)
+
+    def auto_primes(self):
+        reply = self.call("auto_primes")
+        return reply["p"], reply["q"]
+
+    def submit_primes(self, p, q):
+        reply = self.call("primes", p=p, q=q)
+        self.p, self.q = p, q
+        self.n, self.phi, self.exponents = reply["n"], reply["phi"], tuple(reply["exponents"])
+        self.clock.enter(mission.KEYGEN)
+        return reply
+
+    def choose_e(self, e=None):
+        reply = self.call("choose_e", e=e)
+        # d is shown to the player anyway; the local key serves file encryption
+        self.key = rsa_engine.RSAKey(reply["p"], reply["q"], self.n, self.phi, reply["e"], reply["d"])
+        return self.key
+
+    def proceed(self):
+        self.call("proceed")
+        self.clock.enter(mission.ENCRYPT)
+
+    def encrypt(self, message, mode=rsa_engine.MODE_CHAR):
+        self.cipher = self.call("encrypt", message=message, mode=mode)["cipher"]
+        self.mode = mode
+        self.clock.enter(mission.DECRYPT)
+        return self.cipher
+
+    def unlock(self, d):
+        result = self.call("unlock", d=d)
+        self.clock.stop()
+        return {"time_spent": result["time_spent"], "splits": result["splits"]}
+
+    def reveal(self, workers=None):
+        return RemoteStream(self)
+
+    def end(self):
+        if self.session:
+            self.call("end")
+            self.session = None
+
+
+class RemoteStream:
+    """DecryptStream's read interface over the reveal op."""
+
+    def __init__(self, remote):
+        self.remote = remote
+        self.done = False
+
+    def ready(self):
+        return True
+
+    def read(self):
+        if self.done:
+            return ""
+        reply = self.remote.call("reveal")
+        self.done = reply["done"]
+        return reply["text"]
+
+    def close(self):
+        self.done = True
+
+    def __iter__(self):
+        while not self.done:
+            yield self.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSA Vault multi-session game server.")
+    parser.add_argument("--db", default="leaderboard.db")
+    parser.add_argument("--legacy", default="leaderboard.txt", help="old text leaderboard to migrate once")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None, help="key-work processes (default: all cores)")
+    parser.add_argument("--pool", default="key_pool.json", help="key pool warm-start file ('' to disable)")
+    args = parser.parse_args(argv)
+
+    store = LeaderboardStore(args.db, legacy_path=args.legacy)
+    key_pool = KeyPool(rsa_engine.level_ranges(), path=args.pool or None).start()
+    try:
+        asyncio.run(serve(store, args.host, args.port, args.workers, key_pool))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        key_pool.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+KEY POOL
+Ready-made key material per difficulty, generated ahead of time.
+
+Each bundle holds two primes plus everything stages 1 and 2 need: n, phi,
+the e choices shown to the player (and one RANDOM e), and the matching d
+for every one of them. Bundles are produced by worker processes and the
+pool tops itself up after every take(), so AUTO-GENERATE and calc_d never
+wait on prime generation or a primality re-check on the Tk thread.
+
+The pool can be saved to JSON on exit and loaded on the next start, so a
+fresh process has keys ready before the first worker finishes. Loading
+re-checks every saved prime, so start() does it on a background thread.
+The file holds private keys; it is game data, not a key store.
+"""
+import json
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import rsa_engine
+from mission import E_CHOICES
+
+POOL_SIZE = 3       # bundles kept ready per level
+POOL_WORKERS = 1    # key generation stays off the cores the cipher pool uses
+
+
+@dataclass(frozen=True)
+class KeyBundle:
+    level: str
+    p: int
+    q: int
+    n: int
+    phi: int
+    exponents: tuple      # the e buttons of stage 2
+    random_e: int         # what RANDOM e picks, or None
+    private: dict         # e -> d, for every e above
+
+    def key(self, e):
+        """The full RSAKey for one of the bundle's exponents (no re-validation)."""
+        return rsa_engine.RSAKey(self.p, self.q, self.n, self.phi, e, self.private[e])
+
+    def matches(self, p, q):
+        return {p, q} == {self.p, self.q}
+
+
+def make_bundle(level, prime_range, p=None, q=None, random_e=None):
+    """Build a bundle; new primes are drawn when p and q are not given."""
+    rng = random.Random()   # fresh OS seed: forked workers must not share a sequence
+    while True:
+        if p is None or q is None:
+            p, q = rsa_engine.random_prime_pair(prime_range, rng, level=level)
+        n, phi = rsa_engine.compute_modulus(p, q)
+        exponents = tuple(rsa_engine.public_exponents(phi, E_CHOICES))
+        if exponents:
+            break
+        p = q = None   # tiny phi with no valid e: the player could not continue
+
+    if random_e is None and level in rsa_engine.KEY_SIZE_TIERS:
+        random_e = rsa_engine.random_public_exponent(phi, rng)
+    private = {e: rsa_engine.private_exponent(e, phi)
+               for e in exponents + ((random_e,) if random_e else ())}
+    return KeyBundle(level, p, q, n, phi, exponents, random_e, private)
+
+
+def bundle_to_dict(bundle):
+    return {"level": bundle.level, "p": bundle.p, "q": bundle.q, "random_e": bundle.random_e}
+
+
+def bundle_from_dict(data, prime_range):
+    # n, phi, the e list and every d are cheap to re-derive; primes are not,
+    # but checking them is (and a bundle's primes skip the stage 1 checks)
+    p, q = int(data["p"]), int(data["q"])
+    lo, hi = prime_range
+    if p == q or not (lo <= p < hi and lo <= q < hi):
+        raise ValueError(f"saved primes do not fit {data['level']}")
+    if not all(rsa_engine.is_prime(x, rounds=rsa_engine.MR_GEN_ROUNDS) for x in (p, q)):
+        raise ValueError(f"saved {data['level']} key has a composite prime")
+    random_e = data.get("random_e")
+    return make_bundle(data["level"], prime_range, p, q, int(random_e) if random_e else None)
+
+
+class KeyPool:
+    def __init__(self, levels, size=POOL_SIZE, workers=POOL_WORKERS, path=None):
+        """levels: {level: prime_range}. path: JSON file for warm starts."""
+        self.levels = dict(levels)
+        self.size = size
+        self.workers = workers
+        self.path = path
+        self.ready = {level: deque() for level in self.levels}
+        self.pending = {level: 0 for level in self.levels}
+        self.lock = threading.Lock()
+        self._executor = None
+        self._closed = False
+        self._loader = None
+
+    # ============================
+    # TAKING
+    # ============================
+    def take(self, level):
+        """A ready bundle for `level`, or None if the pool is empty (never blocks)."""
+        with self.lock:
+            queue = self.ready.get(level)
+            bundle = queue.popleft() if queue else None
+        self.refill(level)
+        return bundle
+
+    def available(self, level):
+        with self.lock:
+            return len(self.ready.get(level, ()))
+
+    # ============================
+    # REFILLING
+    # ============================
+    def start(self):
+        """Load the saved pool (if any), then fill every level, all in the background."""
+        if self.path and os.path.exists(self.path):
+            self._loader = threading.Thread(target=self._load_and_refill, name="key-pool-load", daemon=True)
+            self._loader.start()
+        else:
+            self.refill_all()
+        return self
+
+    def _load_and_refill(self):
+        self.load(self.path)
+        self.refill_all()
+
+    def refill_all(self):
+        for level in self.levels:
+            self.refill(level)
+
+    def refill(self, level):
+        if self._closed or level not in self.levels:
+            return
+        with self.lock:
+            missing = self.size - len(self.ready[level]) - self.pending[level]
+            self.pending[level] += max(0, missing)
+        for _ in range(missing):
+            future = self.executor().submit(make_bundle, level, self.levels[level])
+            future.add_done_callback(lambda f, lvl=level: self._on_done(lvl, f))
+
+    def _on_done(self, level, future):
+        with self.lock:
+            self.pending[level] -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            self.ready[level].append(future.result())
+
+    def executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self):
+        """Stop the workers (dropping queued work) and save the pool if it has a path."""
+        self._closed = True
+        if self._loader is not None:
+            self._loader.join()   # saving mid-load would drop the unread bundles
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.path:
+            self.save(self.path)
+
+    # ============================
+    # PERSISTENCE
+    # ============================
+    def save(self, path):
+        with self.lock:
+            data = {level: [bundle_to_dict(b) for b in queue] for level, queue in self.ready.items()}
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """Add the bundles saved at `path` (unknown levels and bad entries are skipped)."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        loaded = 0
+        for level, entries in data.items():
+            if level not in self.levels:
+                continue
+            for entry in entries[:self.size]:
+                try:
+                    bundle = bundle_from_dict(entry, self.levels[level])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                with self.lock:
+                    self.ready[level].append(bundle)
+                loaded += 1
+        return loaded
@@ -0,0 +1,228 @@
+"""
+LEADERBOARD STORE
+SQLite-backed mission history for RSA Vault.
+
+Every finished mission goes into `runs` (indexed per difficulty and by
+time). A small `top_runs` table keeps the best TOP_K runs overall and per
+difficulty, updated on every insert, so showing the leaderboard reads at
+most TOP_K rows however much history has piled up. The full history is
+browsed with count() and page(), filtered by difficulty and agent name.
+"""
+import json
+import os
+import sqlite3
+import time
+
+TOP_K = 10
+ALL_LEVELS = "ALL"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    agent       TEXT    NOT NULL,
+    time_spent  REAL    NOT NULL,
+    difficulty  TEXT    NOT NULL,
+    created     REAL    NOT NULL,
+    splits      TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (time_spent, id);
+CREATE INDEX IF NOT EXISTS runs_by_level_time ON runs (difficulty, time_spent, id);
+-- covers agent-name searches over the time-ordered history without row lookups
+CREATE INDEX IF NOT EXISTS runs_search ON runs (time_spent, id, agent, difficulty);
+
+CREATE TABLE IF NOT EXISTS top_runs (
+    scope       TEXT    NOT NULL,
+    run_id      INTEGER NOT NULL,
+    time_spent  REAL    NOT NULL,
+    PRIMARY KEY (scope, run_id)
+);
+CREATE INDEX IF NOT EXISTS top_by_scope_time ON top_runs (scope, time_spent, run_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT
+);
+"""
+
+
+class LeaderboardStore:
+    def __init__(self, path="leaderboard.db", legacy_path=None, top_k=TOP_K):
+        self.path = path
+        self.top_k = top_k
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._upgrade_schema()
+
+        if legacy_path and os.path.exists(legacy_path):
+            self.migrate_text(legacy_path)
+
+    def close(self):
+        self.conn.close()
+
+    def _upgrade_schema(self):
+        """Add columns that databases from older versions are missing."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if "splits" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE runs ADD COLUMN splits TEXT")
+
+    # ============================
+    # WRITES
+    # ============================
+    def add(self, agent, time_spent, difficulty, splits=None):
+        """
+        Record one finished mission; returns its run id.
+        splits is an optional {stage: seconds} dict, stored as JSON.
+        """
+        with self.conn:
+            return self._insert(agent, time_spent, difficulty, time.time(), splits)
+
+    def add_many(self, runs):
+        """Record (agent, time_spent, difficulty[, splits]) runs in a single transaction."""
+        now = time.time()
+        with self.conn:
+            return [self._insert(*run[:3], now, run[3] if len(run) > 3 else None) for run in runs]
+
+    def _insert(self, agent, time_spent, difficulty, created, splits=None):
+        cur = self.conn.execute(
+            "INSERT INTO runs (agent, time_spent, difficulty, created, splits) VALUES (?, ?, ?, ?, ?)",
+            (agent, time_spent, difficulty, created, json.dumps(splits) if splits else None)
+        )
+        run_id = cur.lastrowid
+        for scope in (ALL_LEVELS, difficulty):
+            self._offer_top(scope, run_id, time_spent)
+        return run_id
+
+    def _offer_top(self, scope, run_id, time_spent):
+        """Put a run into a scope's top-K if it beats the current worst."""
+        # the K-th best row exists only once the scope is full
+        rows = self.conn.execute(
+            "SELECT run_id, time_spent FROM top_runs WHERE scope = ? "
+            "ORDER BY time_spent, run_id LIMIT 1 OFFSET ?",
+            (scope, self.top_k - 1)
+        ).fetchall()
+        if rows and (time_spent, run_id) >= (rows[0][1], rows[0][0]):
+            return
+
+        self.conn.execute(
+            "INSERT INTO top_runs (scope, run_id, time_spent) VALUES (?, ?, ?)",
+            (scope, run_id, time_spent)
+        )
+        if rows:
+            self.conn.execute(
+                "DELETE FROM top_runs WHERE scope = ? AND run_id = ?",
+                (scope, rows[0][0])
+            )
+
+    def rebuild_top(self):
+        """Recompute every top-K scope from the full history."""
+        with self.conn:
+            self.conn.execute("DELETE FROM top_runs")
+            self.conn.execute(
+                "INSERT INTO top_runs (scope, run_id, time_spent) "
+                "SELECT ?, id, time_spent FROM runs ORDER BY time_spent, id LIMIT ?",
+                (ALL_LEVELS, self.top_k)
+            )
+            levels = [r[0] for r in self.conn.execute("SELECT DISTINCT difficulty FROM runs")]
+            for level in levels:
+                self.conn.execute(
+                    "INSERT INTO top_runs (scope, run_id, time_spent) "
+                    "SELECT ?, id, time_spent FROM runs WHERE difficulty = ? "
+                    "ORDER BY time_spent, id LIMIT ?",
+                    (level, level, self.top_k)
+                )
+
+    # ============================
+    # READS
+    # ============================
+    def top(self, limit=TOP_K, difficulty=None):
+        """
+        Fastest runs as (agent, time_spent, difficulty) tuples,
+        overall or for one difficulty. Served from the top-K table.
+        """
+        scope = difficulty or ALL_LEVELS
+        return self.conn.execute(
+            "SELECT r.agent, r.time_spent, r.difficulty "
+            "FROM top_runs t JOIN runs r ON r.id = t.run_id "
+            "WHERE t.scope = ? ORDER BY t.time_spent, t.run_id LIMIT ?",
+            (scope, min(limit, self.top_k))
+        ).fetchall()
+
+    def levels(self):
+        """Difficulties that have a top-K list."""
+        return [r[0] for r in self.conn.execute(
+            "SELECT DISTINCT scope FROM top_runs WHERE scope != ?", (ALL_LEVELS,)
+        )]
+
+    def splits(self, run_id):
+        """The {stage: seconds} splits stored with a run ({} if none)."""
+        row = self.conn.execute("SELECT splits FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def count(self, difficulty=None, search=None):
+        """Number of runs, optionally for one difficulty and/or agent names containing `search`."""
+        where, params = self._filter(difficulty, search)
+        return self.conn.execute(f"SELECT COUNT(*) FROM runs{where}", params).fetchone()[0]
+
+    def page(self, offset=0, limit=50, difficulty=None, search=None):
+        """
+        One window of the full history, fastest first, as
+        (run_id, agent, time_spent, difficulty) tuples.
+        The window is picked on the (difficulty,) time_spent, id index alone
+        and only its rows are read, so deep offsets stay cheap.
+        """
+        where, params = self._filter(difficulty, search)
+        return self.conn.execute(
+            "SELECT id, agent, time_spent, difficulty FROM runs WHERE id IN ("
+            f"SELECT id FROM runs{where} ORDER BY time_spent, id LIMIT ? OFFSET ?"
+            ") ORDER BY time_spent, id",
+            params + [max(0, limit), max(0, offset)]
+        ).fetchall()
+
+    @staticmethod
+    def _filter(difficulty, search):
+        clauses, params = [], []
+        if difficulty and difficulty != ALL_LEVELS:
+            clauses.append("difficulty = ?")
+            params.append(difficulty)
+        if search:
+            # substring match on the agent name; LIKE wildcards in the text are literal
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("agent LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    # ============================
+    # ONE-TIME MIGRATION
+    # ============================
+    def migrate_text(self, legacy_path):
+        """
+        Import the old `agent,time,difficulty` leaderboard.txt once.
+        The file is left in place; a meta flag stops a second import.
+        """
+        flag = f"migrated:{os.path.abspath(legacy_path)}"
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (flag,)).fetchone():
+            return 0
+
+        imported = 0
+        mtime = os.path.getmtime(legacy_path)
+        with self.conn, open(legacy_path, "r") as f:
+            for line in f:
+                parts = line.strip().rsplit(",", 2)
+                if len(parts) != 3:
+                    continue
+                agent, time_spent, difficulty = parts
+                try:
+                    time_spent = float(time_spent)
+                except ValueError:
+                    continue
+                self.conn.execute(
+                    "INSERT INTO runs (agent, time_spent, difficulty, created) VALUES (?, ?, ?, ?)",
+                    (agent, time_spent, difficulty, mtime)
+                )
+                imported += 1
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (flag, str(imported)))
+
+        self.rebuild_top()
+        return imported
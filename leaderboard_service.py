@@ -0,0 +1,235 @@
+"""
+LEADERBOARD SERVICE
+One local process that owns the leaderboard database, so several game
+instances on the same machine never write to it at the same time.
+
+Protocol: one JSON object per line over localhost TCP.
+    {"op": "add", "agent": "...", "time_spent": 42.137, "difficulty": "EASY",
+     "splits": {"PRIMES": 10.2, ...}}
+    {"op": "top", "limit": 10, "difficulty": null}
+    {"op": "page", "offset": 0, "limit": 200, "difficulty": null, "search": "bond"}
+    {"op": "count", "difficulty": null, "search": null}
+    {"op": "ping"}
+
+Writes are queued and flushed to SQLite in batches; top-K queries are
+answered from memory, history pages and counts from the database. Run it with:
+    python leaderboard_service.py [--db leaderboard.db] [--port 8765]
+
+Games talk to it through LeaderboardClient, which falls back to opening
+the database directly when the service is not running.
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import socket
+import sqlite3
+import sys
+
+from leaderboard import ALL_LEVELS, TOP_K, LeaderboardStore
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+FLUSH_INTERVAL = 0.25   # seconds between batched writes
+MAX_BATCH = 500         # flush early once this many runs are queued
+
+
+# ============================
+# SERVER
+# ============================
+class LeaderboardService:
+    def __init__(self, store, top_k=TOP_K):
+        self.store = store
+        self.top_k = top_k
+        self.pending = []
+        self._seq = itertools.count()
+        self._flush_now = asyncio.Event()
+
+        # scope -> sorted [(time_spent, seq, agent, difficulty)], at most top_k long
+        self.tops = {}
+        for scope in [ALL_LEVELS] + store.levels():
+            for agent, t, level in store.top(top_k, None if scope == ALL_LEVELS else scope):
+                self.tops.setdefault(scope, []).append((t, next(self._seq), agent, level))
+
+    def add(self, agent, time_spent, difficulty, splits=None):
+        entry = (time_spent, next(self._seq), agent, difficulty)
+        for scope in (ALL_LEVELS, difficulty):
+            top = self.tops.setdefault(scope, [])
+            bisect.insort(top, entry)
+            del top[self.top_k:]
+
+        self.pending.append((agent, time_spent, difficulty, splits))
+        if len(self.pending) >= MAX_BATCH:
+            self._flush_now.set()
+
+    def top(self, limit=TOP_K, difficulty=None):
+        rows = self.tops.get(difficulty or ALL_LEVELS, [])[:limit]
+        return [(agent, t, level) for t, _, agent, level in rows]
+
+    def flush(self):
+        """Write the queued runs; if that fails they stay queued for the next flush."""
+        if self.pending:
+            # add_many is one transaction, so a failed batch left nothing behind
+            self.store.add_many(self.pending)
+            self.pending = []
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as err:   # e.g. locked: keep the runs, retry next interval
+                print(f"leaderboard: {len(self.pending)} runs not saved yet: {err}", file=sys.stderr)
+
+    async def handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    reply = self.dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError, sqlite3.Error) as err:
+                    reply = {"ok": False, "error": str(err)}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def dispatch(self, req):
+        op = req["op"]
+        if op == "add":
+            splits = {str(k): float(v) for k, v in (req.get("splits") or {}).items()}
+            self.add(str(req["agent"]), float(req["time_spent"]), str(req["difficulty"]), splits)
+            return {"ok": True}
+        if op == "top":
+            rows = self.top(int(req.get("limit", TOP_K)), req.get("difficulty"))
+            return {"ok": True, "rows": rows}
+        if op in ("page", "count"):
+            try:
+                self.flush()   # queued runs must show up in the history
+            except sqlite3.Error:
+                pass           # still queued; the read may work anyway
+            difficulty, search = req.get("difficulty"), req.get("search")
+            if op == "count":
+                return {"ok": True, "count": self.store.count(difficulty, search)}
+            rows = self.store.page(int(req.get("offset", 0)), int(req.get("limit", 50)), difficulty, search)
+            return {"ok": True, "rows": rows}
+        if op == "ping":
+            return {"ok": True}
+        raise ValueError(f"unknown op {op!r}")
+
+
+async def serve(store, host=HOST, port=PORT):
+    service = LeaderboardService(store)
+    server = await asyncio.start_server(service.handle, host, port)
+    flusher = asyncio.create_task(service.flush_loop())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        flusher.cancel()
+        service.flush()
+
+
+# ============================
+# CLIENT
+# ============================
+class ServiceUnavailable(OSError):
+    """The service could not be reached, so nothing was sent."""
+
+
+class LeaderboardClient:
+    """
+    Same add/top/page/count interface as LeaderboardStore, backed by the service.
+    If the service cannot be reached, the database is opened directly
+    (SQLite's own locking keeps that safe, just without the batching).
+    A run is only written directly when no connection was made at all:
+    once a request is sent the service may have queued it, so later
+    failures are raised instead of risking a duplicate. Database errors
+    on the direct path are raised as OSError, like an unreachable service.
+    """
+
+    def __init__(self, db_path="leaderboard.db", legacy_path=None, host=HOST, port=PORT, timeout=0.5):
+        self.db_path = db_path
+        self.legacy_path = legacy_path
+        self.address = (host, port)
+        self.timeout = timeout
+        self._direct = None
+
+    def _request(self, payload):
+        try:
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+        except OSError as err:
+            raise ServiceUnavailable(*err.args) from err
+        with sock:
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            reply = json.loads(sock.makefile("rb").readline())
+        if not reply.get("ok"):
+            raise ValueError(reply.get("error", "leaderboard service error"))
+        return reply
+
+    def direct(self):
+        if self._direct is None:
+            self._direct = LeaderboardStore(self.db_path, legacy_path=self.legacy_path)
+        return self._direct
+
+    def _direct_call(self, method, *args):
+        try:
+            return getattr(self.direct(), method)(*args)
+        except sqlite3.Error as err:   # locked, unreadable, ...
+            raise OSError(f"leaderboard database: {err}") from err
+
+    def add(self, agent, time_spent, difficulty, splits=None):
+        try:
+            self._request({"op": "add", "agent": agent, "time_spent": time_spent,
+                           "difficulty": difficulty, "splits": splits})
+        except ServiceUnavailable:
+            self._direct_call("add", agent, time_spent, difficulty, splits)
+
+    def top(self, limit=TOP_K, difficulty=None):
+        try:
+            rows = self._request({"op": "top", "limit": limit, "difficulty": difficulty})["rows"]
+            return [tuple(r) for r in rows]
+        except (OSError, ValueError):
+            return self._direct_call("top", limit, difficulty)
+
+    def page(self, offset=0, limit=50, difficulty=None, search=None):
+        try:
+            rows = self._request({"op": "page", "offset": offset, "limit": limit,
+                                  "difficulty": difficulty, "search": search})["rows"]
+            return [tuple(r) for r in rows]
+        except (OSError, ValueError):
+            return self._direct_call("page", offset, limit, difficulty, search)
+
+    def count(self, difficulty=None, search=None):
+        try:
+            return self._request({"op": "count", "difficulty": difficulty, "search": search})["count"]
+        except (OSError, ValueError):
+            return self._direct_call("count", difficulty, search)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared RSA Vault leaderboard service.")
+    parser.add_argument("--db", default="leaderboard.db")
+    parser.add_argument("--legacy", default="leaderboard.txt", help="old text leaderboard to migrate once")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args(argv)
+
+    store = LeaderboardStore(args.db, legacy_path=args.legacy)
+    try:
+        asyncio.run(serve(store, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
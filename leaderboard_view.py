@@ -0,0 +1,168 @@
+"""
+LEADERBOARD VIEW
+Virtualized table over the full mission history.
+
+The Treeview only ever holds one screenful of rows. Scrolling moves a
+virtual offset; the rows under it are fetched from the store in blocks of
+BLOCK_ROWS (a few blocks are cached), so the table costs the same whether
+the history holds ten runs or a million. Difficulty and name filters go
+straight into the store's SQL.
+
+`source` is anything with page(offset, limit, difficulty, search) and
+count(difficulty, search): a LeaderboardStore or a LeaderboardClient.
+An OSError from it empties the table and shows up in status().
+"""
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+
+VISIBLE_ROWS = 15
+BLOCK_ROWS = 200
+CACHED_BLOCKS = 8
+COLUMNS = (("rank", "RANK", 80, "center"),
+           ("agent", "AGENT NAME", 360, "w"),
+           ("time", "TIME TAKEN (s)", 160, "center"),
+           ("level", "LEVEL", 120, "center"))
+
+
+class LeaderboardView:
+    def __init__(self, parent, source, bg, row_bg, fg, header_bg, header_fg, font, header_font,
+                 rows=VISIBLE_ROWS):
+        self.source = source
+        self.rows = rows
+        self.difficulty = None
+        self.search = ""
+        self.total = 0
+        self.offset = 0
+        self.error = None
+        self.blocks = OrderedDict()
+        self._refresh_pending = False
+        self.on_change = None   # called after every redraw (e.g. to update a page label)
+
+        style = ttk.Style(parent)
+        style.configure("Vault.Treeview", background=row_bg, fieldbackground=row_bg,
+                        foreground=fg, font=font, rowheight=26, borderwidth=0)
+        style.configure("Vault.Treeview.Heading", background=header_bg, foreground=header_fg,
+                        font=header_font, relief="flat")
+        style.map("Vault.Treeview", background=[("selected", header_bg)])
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.tree = ttk.Treeview(self.frame, columns=[c[0] for c in COLUMNS], show="headings",
+                                 height=rows, style="Vault.Treeview", selectmode="none")
+        for key, title, width, anchor in COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor=anchor, stretch=key == "agent")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        # fixed item ids, reused on every redraw
+        self.items = [self.tree.insert("", "end", values=("", "", "", "")) for _ in range(rows)]
+
+        for widget in (self.tree, self.scrollbar):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+            widget.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+        self.tree.bind("<Prior>", lambda e: self.page(-1))
+        self.tree.bind("<Next>", lambda e: self.page(1))
+
+    def pack(self, **kw):
+        self.frame.pack(**kw)
+        return self
+
+    # ============================
+    # FILTERS + POSITION
+    # ============================
+    def set_filter(self, difficulty=None, search=""):
+        """Show runs for one difficulty (None = all) whose agent contains `search`."""
+        self.difficulty = difficulty or None
+        self.search = search.strip()
+        self.blocks.clear()
+        self.offset = 0
+        try:
+            self.total = self.source.count(self.difficulty, self.search or None)
+            self.error = None
+        except OSError as err:
+            self.total, self.error = 0, err
+        self.refresh()
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.total - self.rows))
+        if offset != self.offset:
+            self.offset = offset
+            self._schedule_refresh()
+
+    def page(self, delta):
+        self.scroll_to(self.offset + delta * self.rows)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def _on_wheel(self, event):
+        self.scroll_to(self.offset - 3 * (1 if event.delta > 0 else -1))
+
+    # ============================
+    # DRAWING
+    # ============================
+    def _schedule_refresh(self):
+        # a drag fires many scroll events per frame; draw once when idle
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.frame.after_idle(self.refresh)
+
+    def _block(self, index):
+        block = self.blocks.get(index)
+        if block is None:
+            block = self.source.page(index * BLOCK_ROWS, BLOCK_ROWS, self.difficulty, self.search or None)
+            self.blocks[index] = block
+            if len(self.blocks) > CACHED_BLOCKS:
+                self.blocks.popitem(last=False)
+        else:
+            self.blocks.move_to_end(index)
+        return block
+
+    def visible(self):
+        """(rank, run) pairs for the rows currently on screen."""
+        out = []
+        for pos in range(self.offset, min(self.offset + self.rows, self.total)):
+            block = self._block(pos // BLOCK_ROWS)
+            i = pos % BLOCK_ROWS
+            if i >= len(block):
+                break   # history shrank under us; the next set_filter recounts
+            out.append((pos + 1, block[i]))
+        return out
+
+    def refresh(self):
+        self._refresh_pending = False
+        if not self.frame.winfo_exists():
+            return
+        try:
+            shown = self.visible()
+        except OSError as err:
+            shown, self.error = [], err
+        for item, row in zip(self.items, shown):
+            rank, (_, agent, time_spent, level) = row
+            self.tree.item(item, values=(f"#{rank}", agent, f"{time_spent:.3f} s", level))
+        for item in self.items[len(shown):]:
+            self.tree.item(item, values=("", "", "", ""))
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total,
+                               min(1.0, (self.offset + self.rows) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if self.on_change:
+            self.on_change()
+
+    def status(self):
+        if self.error is not None:
+            return f"Leaderboard unavailable: {self.error}"
+        if not self.total:
+            return "No mission data recorded yet."
+        last = min(self.offset + self.rows, self.total)
+        return f"{self.offset + 1:,}–{last:,} of {self.total:,} runs"
@@ -1,11 +1,20 @@
+import time
+STARTUP_T0 = time.perf_counter()   # --profile-startup counts from here
+
+# Only what the welcome screen needs is imported here. The leaderboard,
+# key pool, audio and file modules load on first use (see warm_up).
 import tkinter as tk
 from tkinter import messagebox
-import random
-import math
+from tkinter import font as tkfont
 import os
-import winsound
-import threading
-import time   # <-- needed to control hover sound
+import math
+
+import rsa_engine
+import display
+from animation import AnimationScheduler
+from effects import Backdrop, SweepDivider
+from mission_clock import MissionClock
+from mission import MISSION_SECONDS, LocalGame, MissionError
 
 # ============================
 # CLEAN MODERN UI THEME
@@ -23,9 +32,35 @@ TEXT_PRIMARY = "#e6e6e6"
 TEXT_SECONDARY = "#9ca3af"
 HIGHLIGHT = "#1f2937"
 
+# Floating particles on the welcome screen (canvas items, cheap to raise)
+WELCOME_PARTICLES = 120
+
+# Leaderboard search waits this long after the last keystroke
+SEARCH_DELAY_MS = 250
+
+# The success screen reveals any message within this time, a batch of
+# characters per frame
+REVEAL_BUDGET_MS = 2500
+REVEAL_FRAME_MS = 30
+
+# Sound, key pool and leaderboard are set up this long after the first paint
+WARM_UP_DELAY_MS = 200
+
+# File jobs run on a worker thread; the UI checks their progress this often
+FILE_POLL_MS = 100
+
+# How long COPY d shows its confirmation
+COPY_FEEDBACK_MS = 1500
+
+# Collapsed length of d (42pt label) and of n / φ in the stage 2 briefing
+D_PREVIEW_CHARS = 20
+BRIEFING_NUMBER_CHARS = 48
+
 class RSAVaultFinal:
-    def __init__(self, root):
+    def __init__(self, root, profiler=None, game=None, startup=None):
         self.root = root
+        self.profiler = profiler
+        self.startup = startup
         self.root.title("RSA MISSION CONTROL v3.2")
         self.root.geometry("1150x680")
         self.root.configure(bg=BG_COLOR)
@@ -33,13 +68,30 @@ class RSAVaultFinal:
         # State Variables
         self.agent_name = "Unknown Agent"
         self.p = self.q = self.n = self.phi = self.e = self.d = 0
-        self.time_left = 120       
+        self.key = None
+        self.cipher_mode = rsa_engine.MODE_CHAR
+        self.time_left = MISSION_SECONDS
         self.timer_running = False
         self.time_spent = 0
-        self.leaderboard_file = "leaderboard.txt"
+        self.clock = MissionClock(MISSION_SECONDS)
+        self._timer_after = None
+        self.leaderboard_file = "leaderboard.txt"   # legacy text file, migrated once
         self.difficulty = ""
         self.current_range = (10, 50)
 
+        # Missions run here, or on game_server.py (a GameClient, which also serves
+        # the leaderboard). The local game is built on first use.
+        self._game = game
+        self._leaderboard = game
+        self.mission = None
+
+        # How big numbers are shown (DEC / HEX / B64); long ones start collapsed
+        self.number_mode = display.DEC
+        self.d_expanded = False
+        self._cipher_anim = None
+        self._reveal_stream = None
+        self._file_job = None
+
         # Progress tracker
         self.stage_names = [
             "IDENTITY",
@@ -52,49 +104,143 @@ class RSAVaultFinal:
         ]
         self.current_stage_index = 0
 
-        # ==== NEW: hover sound control (prevents delay) ====
-        self.last_hover_time = 0
+        # ==== Sound: one worker thread, pre-rendered tones (started on first use) ====
+        self._audio = None
+
+        self.particle_count = WELCOME_PARTICLES
+
+        # Retained mission shell (built on first stage) and shared fonts
+        self.shell = None
+        self._fonts = {}
+
+        # One frame clock for every animation (cancelled per screen)
+        self.animator = AnimationScheduler(self.root, fps=60)
+        self.animator.profiler = profiler
+
+        # Callbacks waiting for the window's first paint
+        self._drawn = False
+        self._on_drawn = []
+        self.root.bind("<Map>", self._on_map, add="+")
+        if startup:
+            self.when_drawn(self.report_startup)
 
         self.setup_welcome_screen()
+        self.when_drawn(lambda: self.root.after(WARM_UP_DELAY_MS, self.warm_up))
+        if startup:
+            startup.mark("welcome screen")
+
+    # ============================
+    # LAZY STARTUP
+    # ============================
+    def when_drawn(self, callback):
+        """Run callback once the window is mapped and drawn (at the next idle if it already is)."""
+        if self._drawn:
+            self.root.after_idle(callback)
+        else:
+            self._on_drawn.append(callback)
+
+    def _on_map(self, event):
+        if event.widget is not self.root or self._drawn:
+            return
+        self._drawn = True
+        # idle callbacks run after Tk has redrawn the exposed window
+        for callback in self._on_drawn:
+            self.root.after_idle(callback)
+        self._on_drawn.clear()
+
+    def report_startup(self):
+        self.root.update_idletasks()
+        self.startup.mark("first paint")
+        print(self.startup.report())
+
+    def warm_up(self):
+        """Build what the first mission needs while the player reads the welcome screen."""
+        self.audio   # each property builds its object on first access
+        self.game
+        if self.startup:
+            print(self.startup.note("warm-up (sound, keys, db)"))
+
+    @property
+    def audio(self):
+        if self._audio is None:
+            from audio import AudioWorker
+            self._audio = AudioWorker()
+        return self._audio
+
+    @property
+    def leaderboard(self):
+        """Talks to leaderboard_service.py if it is running, else opens the DB directly."""
+        if self._leaderboard is None:
+            from leaderboard_service import LeaderboardClient
+            self._leaderboard = LeaderboardClient("leaderboard.db", legacy_path=self.leaderboard_file)
+        return self._leaderboard
+
+    @property
+    def game(self):
+        if self._game is None:
+            # keys for every level, generated by a worker process and kept on disk
+            from key_pool import KeyPool
+            key_pool = KeyPool(rsa_engine.level_ranges(), path="key_pool.json").start()
+            self._game = LocalGame(self.leaderboard, key_pool)
+        return self._game
+
+    def close(self):
+        self.cancel_file_job()
+        if self._game is not None:
+            self._game.close()
+        if self._audio is not None:
+            self._audio.close()
 
     # ============================
     # 🔊 SOUND EFFECTS (FIXED DELAY)
     # ============================
     def play_hover_sound(self):
-        """Play hover sound only if enough time has passed (prevents stacking)."""
-        now = time.time()
-        if now - self.last_hover_time > 0.0001: 
-            self.last_hover_time = now
-            threading.Thread(
-                target=lambda: winsound.Beep(2400, 15),
-                daemon=True
-            ).start()
+        """Queue the hover blip (bursts are merged by the audio worker)."""
+        self.audio.play("hover")
 
     def play_click_sound(self):
         """Clear confirmation sound on click."""
-        threading.Thread(
-            target=lambda: winsound.Beep(900, 120),
-            daemon=True
-        ).start()
+        self.audio.play("click")
 
     # ============================
     # UI UTILITIES
     # ============================
 
     def clear_screen(self):
+        """Destroy the current full-window screen; the mission shell is only hidden."""
+        self.animator.clear_screen()
+        overlay = self.profiler.overlay if self.profiler else None
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if widget is not self.shell and widget is not overlay:
+                widget.destroy()
+        if self.shell is not None:
+            self.shell.pack_forget()
+
+    def font(self, *spec):
+        """Shared tkfont.Font for a ("family", size, "weight") spec, created once."""
+        f = self._fonts.get(spec)
+        if f is None:
+            family, size, *style = spec
+            f = self._fonts[spec] = tkfont.Font(
+                root=self.root, family=family, size=size,
+                weight=style[0] if style else "normal"
+            )
+        return f
 
     def styled_button(self, parent, text, command, color=ACCENT_GREEN, width=22):
+        on_click = lambda: self.animate_button(btn, command)
+        if self.profiler:
+            on_click = self.profiler.wrap(on_click, "button", label=f"button: {text}")
+
         btn = tk.Button(
             parent,
             text=text,
-            command=lambda: self.animate_button(btn, command),
+            command=on_click,
             bg=BTN_BG,
             fg=color,
             activebackground=color,
             activeforeground=BG_COLOR,
-            font=("Courier New", 11, "bold"),
+            font=self.font("Courier New", 11, "bold"),
             width=width,
             height=2,
             bd=1,
@@ -112,8 +258,8 @@ class RSAVaultFinal:
         self.root.after(120, lambda: btn.config(bg=original_color))
         self.root.after(150, command)
 
-    def draw_progress(self):
-        prog_frame = tk.Frame(self.left_panel, bg=BTN_BG)
+    def draw_progress(self, parent):
+        prog_frame = tk.Frame(parent, bg=BTN_BG)
         prog_frame.pack(pady=12)
 
         tk.Label(
@@ -121,30 +267,36 @@ class RSAVaultFinal:
             text="MISSION PROGRESS",
             fg=ACCENT_GREEN,
             bg=BTN_BG,
-            font=("Courier New", 10, "bold")
+            font=self.font("Courier New", 10, "bold")
         ).pack()
 
         bar_container = tk.Frame(prog_frame, bg=HIGHLIGHT, height=8, width=280)
         bar_container.pack(pady=6)
 
-        filled_width = int((self.current_stage_index / (len(self.stage_names)-1)) * 280)
-
-        bar = tk.Frame(bar_container, bg=ACCENT_GREEN, height=8, width=filled_width)
-        bar.place(x=0, y=0)
+        self.progress_bar = tk.Frame(bar_container, bg=ACCENT_GREEN, height=8, width=0)
+        self.progress_bar.place(x=0, y=0)
 
         dots_frame = tk.Frame(prog_frame, bg=BTN_BG)
         dots_frame.pack(pady=6)
 
-        for i, stage in enumerate(self.stage_names):
-            color = ACCENT_GREEN if i <= self.current_stage_index else "#555555"
+        self.progress_dots = []
+        for stage in self.stage_names:
             dot = tk.Label(
                 dots_frame,
                 text="●",
-                fg=color,
+                fg="#555555",
                 bg=BTN_BG,
-                font=("Courier New", 10)
+                font=self.font("Courier New", 10)
             )
             dot.pack(side="left", padx=5)
+            self.progress_dots.append(dot)
+
+    def update_progress(self):
+        filled_width = int((self.current_stage_index / (len(self.stage_names)-1)) * 280)
+        self.progress_bar.config(width=filled_width)
+
+        for i, dot in enumerate(self.progress_dots):
+            dot.config(fg=ACCENT_GREEN if i <= self.current_stage_index else "#555555")
 
     # ============================
     # MAIN LAYOUT (LEFT + RIGHT)
@@ -156,13 +308,16 @@ class RSAVaultFinal:
             return ACCENT_YELLOW
         elif self.difficulty == "HARD":
             return ACCENT_RED
+        elif self.difficulty in rsa_engine.KEY_SIZE_TIERS:
+            return ACCENT_BLUE
         return ACCENT_GREEN
 
-    def create_layout(self, stage_name, instruction):
-        self.clear_screen()
+    def build_shell(self):
+        """Left panel + workspace host, built once and reused by every stage."""
+        self.shell = tk.Frame(self.root, bg=BG_COLOR)
 
         # LEFT PANEL
-        self.left_panel = tk.Frame(self.root, bg=BTN_BG, width=360)
+        self.left_panel = tk.Frame(self.shell, bg=BTN_BG, width=360)
         self.left_panel.pack(side="left", fill="y")
         self.left_panel.pack_propagate(False)
 
@@ -177,65 +332,59 @@ class RSAVaultFinal:
             text="🕵️",
             fg=ACCENT_GREEN,
             bg=HIGHLIGHT,
-            font=("Courier New", 14)
+            font=self.font("Courier New", 14)
         ).pack(side="left")
 
-        tk.Label(
+        self.agent_label = tk.Label(
             left_info,
-            text=f"  {self.agent_name}",
             fg=ACCENT_GREEN,
             bg=HIGHLIGHT,
-            font=("Courier New", 11, "bold")
-        ).pack(side="left")
+            font=self.font("Courier New", 11, "bold")
+        )
+        self.agent_label.pack(side="left")
 
         level_badge = tk.Frame(agent_card, bg=BG_COLOR, padx=8, pady=3)
         level_badge.pack(side="right")
 
-        tk.Label(
+        self.level_label = tk.Label(
             level_badge,
-            text=f"🔷 {self.difficulty}",
-            fg=self.get_difficulty_color(),
             bg=BG_COLOR,
-            font=("Courier New", 10, "bold")
-        ).pack()
+            font=self.font("Courier New", 10, "bold")
+        )
+        self.level_label.pack()
 
         timer_pill = tk.Frame(self.left_panel, bg=BG_COLOR, padx=10, pady=5)
         timer_pill.pack(pady=5)
 
         self.timer_label = tk.Label(
             timer_pill,
-            text=f"⏱ {self.time_left}s",
             fg=ACCENT_GREEN,
             bg=BG_COLOR,
-            font=("Courier New", 12, "bold")
+            font=self.font("Courier New", 12, "bold")
         )
         self.timer_label.pack()
 
-        self.draw_progress()
+        self.draw_progress(self.left_panel)
 
         status_card = tk.Frame(self.left_panel, bg=HIGHLIGHT, padx=15, pady=12)
         status_card.pack(pady=15, padx=15, fill="x")
 
-        status_color = self.get_difficulty_color() if stage_name == "DIFFICULTY" else ACCENT_GREEN
-
-
-        tk.Label(
+        self.status_title = tk.Label(
             status_card,
-            text=f"STATUS: {stage_name}",
-            fg=status_color,
             bg=HIGHLIGHT,
-            font=("Courier New", 12, "bold")
-        ).pack(anchor="w")
+            font=self.font("Courier New", 12, "bold")
+        )
+        self.status_title.pack(anchor="w")
 
-        tk.Label(
+        self.status_text = tk.Label(
             status_card,
-            text=instruction,
             fg=TEXT_PRIMARY,
             bg=HIGHLIGHT,
-            font=("Courier New", 10),
+            font=self.font("Courier New", 10),
             wraplength=300,
             justify="left"
-        ).pack(anchor="w", pady=(5, 0))
+        )
+        self.status_text.pack(anchor="w", pady=(5, 0))
 
         self.styled_button(
             self.left_panel,
@@ -245,9 +394,41 @@ class RSAVaultFinal:
             width=16
         ).pack(side="bottom", pady=25)
 
+        # RIGHT PANEL: one cached workspace per stage, stacked and raised on demand
+        self.workspace_host = tk.Frame(self.shell, bg=BG_COLOR)
+        self.workspace_host.pack(side="right", expand=True, fill="both")
+        self.workspaces = {}
+
+    def create_layout(self, stage_name, instruction):
+        """
+        Show the mission shell for a stage and point self.workspace at that
+        stage's cached frame. Returns True the first time a stage is shown,
+        when the caller still has to build its widgets.
+        """
+        self.clear_screen()
+        if self.shell is None:
+            self.build_shell()
+        self.shell.pack(expand=True, fill="both")
+
+        # LEFT PANEL (updated in place)
+        self.agent_label.config(text=f"  {self.agent_name}")
+        self.level_label.config(text=f"🔷 {self.difficulty}", fg=self.get_difficulty_color())
+        self.timer_label.config(text=f"⏱ {self.time_left}s")
+        self.update_progress()
+
+        status_color = self.get_difficulty_color() if stage_name == "DIFFICULTY" else ACCENT_GREEN
+        self.status_title.config(text=f"STATUS: {stage_name}", fg=status_color)
+        self.status_text.config(text=instruction)
+
         # RIGHT PANEL
-        self.workspace = tk.Frame(self.root, bg=BG_COLOR)
-        self.workspace.pack(side="right", expand=True, fill="both")
+        fresh = stage_name not in self.workspaces
+        if fresh:
+            frame = tk.Frame(self.workspace_host, bg=BG_COLOR)
+            frame.place(x=0, y=0, relwidth=1, relheight=1)
+            self.workspaces[stage_name] = frame
+        self.workspace = self.workspaces[stage_name]
+        self.workspace.tkraise()
+        return fresh
 
     def abort_mission(self):
         self.timer_running = False
@@ -258,39 +439,24 @@ class RSAVaultFinal:
     # ✨ ENHANCED FRONT PAGE ✨
     # ============================
     def setup_welcome_screen(self):
+        self.stop_reveal()
+        self.cancel_file_job()
         self.timer_running = False
-        self.time_left = 120
+        self.time_left = MISSION_SECONDS
         self.time_spent = 0
         self.difficulty = ""            
         self.current_stage_index = 0
         self.clear_screen()
 
-        # Smooth moving scan line
-        self.scan_line = tk.Frame(self.root, bg=ACCENT_GREEN, height=2, width=300)
-        self.scan_line.place(x=0, y=140)
-
-        def animate_scan():
-            x = (self.scan_line.winfo_x() + 12) % max(1, self.root.winfo_width())
-            self.scan_line.place(x=x, y=140)
-            self.root.after(35, animate_scan)
-
-        animate_scan()
-
-        # Floating cyber particles
-        self.particles = []
-        for _ in range(12):
-            p = tk.Label(self.root, text="•", fg=ACCENT_BLUE, bg=BG_COLOR, font=("Courier New", 10))
-            p.place(x=random.randint(0, 1100), y=random.randint(0, 650))
-            self.particles.append(p)
-
-        def animate_particles():
-            for p in self.particles:
-                x = p.winfo_x() + random.choice([-2, -1, 1, 2])
-                y = p.winfo_y() + random.choice([-1, 1])
-                p.place(x=x % 1100, y=y % 650)
-            self.root.after(80, animate_particles)
-
-        animate_particles()
+        # Smooth moving scan line + floating cyber particles, all on one canvas
+        # (particles and animations start after the screen is first drawn)
+        self.backdrop = backdrop = Backdrop(
+            self.root,
+            bg=BG_COLOR,
+            particle_color=ACCENT_BLUE,
+            scan_color=ACCENT_GREEN,
+            particle_count=0
+        )
 
         main_frame = tk.Frame(self.root, bg=BG_COLOR)
         main_frame.place(relx=0.5, rely=0.5, anchor="center")
@@ -301,7 +467,7 @@ class RSAVaultFinal:
             text="R S A   V A U L T",
             fg=ACCENT_GREEN,
             bg=BG_COLOR,
-            font=("Courier New", 44, "bold")
+            font=self.font("Courier New", 44, "bold")
         )
         self.title_label.pack()
 
@@ -312,9 +478,17 @@ class RSAVaultFinal:
             green = 255 - glow_state["brightness"] * 15
             color = f"#00{green:02x}66"
             self.title_label.config(fg=color)
-            self.root.after(120, animate_glow)
 
-        animate_glow()
+        def start_effects():
+            # the player may already have left this screen
+            if backdrop is not self.backdrop or not backdrop.canvas.winfo_exists():
+                return
+            backdrop.add_particles(self.particle_count)
+            self.animator.add(backdrop.step_scan, 35)
+            self.animator.add(backdrop.step_particles, 1000 / 60)
+            self.animator.add(animate_glow, 120)
+
+        self.when_drawn(start_effects)
 
         tk.Frame(main_frame, bg=ACCENT_GREEN, height=2, width=260).pack(pady=8)
 
@@ -323,7 +497,7 @@ class RSAVaultFinal:
             text="Secure Data Transmission Training Simulator",
             fg=TEXT_SECONDARY,
             bg=BG_COLOR,
-            font=("Courier New", 12)
+            font=self.font("Courier New", 12)
         ).pack(pady=10)
 
         card = tk.Frame(main_frame, bg=HIGHLIGHT, padx=25, pady=20)
@@ -334,7 +508,7 @@ class RSAVaultFinal:
             text="MISSION OBJECTIVES",
             fg=ACCENT_BLUE,
             bg=HIGHLIGHT,
-            font=("Courier New", 12, "bold")
+            font=self.font("Courier New", 12, "bold")
         ).pack()
 
         tk.Label(
@@ -347,7 +521,7 @@ class RSAVaultFinal:
             ),
             fg=TEXT_PRIMARY,
             bg=HIGHLIGHT,
-            font=("Courier New", 10),
+            font=self.font("Courier New", 10),
             justify="left"
         ).pack(pady=5)
 
@@ -373,7 +547,7 @@ class RSAVaultFinal:
             text="IDENTITY VERIFICATION",
             fg=ACCENT_GREEN,
             bg=BG_COLOR,
-            font=("Courier New", 20, "bold")
+            font=self.font("Courier New", 20, "bold")
         ).pack(pady=10)
 
         tk.Label(
@@ -381,12 +555,12 @@ class RSAVaultFinal:
             text="Enter your Agent Name to begin your mission:",
             fg=TEXT_PRIMARY,
             bg=BG_COLOR,
-            font=("Courier New", 11)
+            font=self.font("Courier New", 11)
         ).pack(pady=5)
 
         self.name_entry = tk.Entry(
             cont,
-            font=("Courier New", 20),
+            font=self.font("Courier New", 20),
             bg=BTN_BG,
             fg=ACCENT_GREEN,
             justify="center",
@@ -423,39 +597,53 @@ class RSAVaultFinal:
     # DIFFICULTY
     # ============================
     def difficulty_selection(self):
-        self.create_layout(
+        if not self.create_layout(
             "DIFFICULTY",
             f"Agent {self.agent_name}, choose your mission complexity:\n\n"
             "EASY   → Best for beginners\n"
             "MEDIUM → Balanced challenge\n"
-            "HARD   → More complex encryption"
-        )
+            "HARD   → More complex encryption\n\n"
+            "RSA-512 / 1024 / 2048 → Real key sizes\n"
+            "(use AUTO-GENERATE for the primes)"
+        ):
+            return
 
         cont = tk.Frame(self.workspace, bg=BG_COLOR)
         cont.place(relx=0.5, rely=0.5, anchor="center")
 
-        levels = {"EASY": (1, 50), "MEDIUM": (50, 150), "HARD": (150, 300)}
-
-        for lvl, r in levels.items():
-            color = ACCENT_GREEN if lvl == "EASY" else ACCENT_YELLOW if lvl == "MEDIUM" else ACCENT_RED
-            self.styled_button(cont, lvl, lambda l=lvl, rr=r: self.start_game(l, rr), color=color).pack(pady=10)
+        for lvl, r in rsa_engine.level_ranges().items():
+            color = ACCENT_GREEN if lvl == "EASY" else ACCENT_YELLOW if lvl == "MEDIUM" else ACCENT_RED if lvl == "HARD" else ACCENT_BLUE
+            self.styled_button(cont, lvl, lambda l=lvl, rr=r: self.start_game(l, rr), color=color).pack(pady=6)
 
 
     def start_game(self, level, r):
+        try:
+            if self.mission is not None:
+                self.mission.end()
+                self.mission = None
+            mission = self.game.new_mission(self.agent_name, level)
+            mission.start()
+        except (MissionError, OSError) as err:
+            self.show_mission_error(err)
+            return
+        self.mission = mission
         self.time_spent = 0
         self.difficulty = level
         self.current_range = r
-        self.time_left = 120         
+        self.time_left = MISSION_SECONDS
         self.current_stage_index = 2
         self.timer_running = True
-        self.update_timer()           
+        self.clock = mission.clock
+        if self._timer_after is not None:
+            self.root.after_cancel(self._timer_after)
+        self.update_timer()
         self.stage_1_prime_input()
 
     # ============================
     # STAGE 1: PRIME INPUT
     # ============================
     def stage_1_prime_input(self):
-        self.create_layout(
+        if self.create_layout(
             "STAGE 1: PRIME SELECTION",
             "RSA begins with two PRIME numbers (p and q).\n\n"
             "A PRIME number has only two factors: 1 and itself.\n"
@@ -464,15 +652,20 @@ class RSAVaultFinal:
             f"• Enter your own PRIME numbers based on {self.difficulty} level, OR\n"
 
             "• Click AUTO-GENERATE to let the system choose."
-        )
+        ):
+            self.build_prime_input()
+
+        self.p_entry.delete(0, tk.END)
+        self.q_entry.delete(0, tk.END)
 
+    def build_prime_input(self):
         input_cont = tk.Frame(self.workspace, bg=BG_COLOR)
         input_cont.place(relx=0.5, rely=0.5, anchor="center")
         tk.Label(input_cont, text="PRIME p:", fg=ACCENT_GREEN, bg=BG_COLOR).grid(row=0, column=0, pady=10)
         vcmd = (self.root.register(self.validate_numeric_input), "%P")
         self.p_entry = tk.Entry(
             input_cont,
-            font=("Courier New", 14),
+            font=self.font("Courier New", 14),
             bg=BTN_BG,
             fg="white",
             validate="key",
@@ -482,7 +675,7 @@ class RSAVaultFinal:
         tk.Label(input_cont, text="PRIME q:", fg=ACCENT_GREEN, bg=BG_COLOR).grid(row=1, column=0, pady=10)
         self.q_entry = tk.Entry(
             input_cont,
-            font=("Courier New", 14),
+            font=self.font("Courier New", 14),
             bg=BTN_BG,
             fg="white",
             validate="key",
@@ -497,38 +690,26 @@ class RSAVaultFinal:
         try:
             p_val = int(self.p_entry.get())
             q_val = int(self.q_entry.get())
-
-            # ❌ Prevent negative numbers
-            if p_val < 0 or q_val < 0:
-                messagebox.showerror("INPUT ERROR", "Prime numbers cannot be negative.")
-                return
-
-            # ❌ Prevent identical primes
-            if p_val == q_val:
-                messagebox.showerror("INPUT ERROR", "p and q must be different primes.")
-                return
-
-            # ✅ Apply difficulty-based validation
-            if not self.validate_prime_by_difficulty(p_val):
-                return
-            if not self.validate_prime_by_difficulty(q_val):
-                return
-
-            # ✅ Finally check primality
-            if self.is_prime(p_val) and self.is_prime(q_val):
-                self.p, self.q = p_val, q_val
-                self.current_stage_index = 3
-                self.stage_2_keygen()
-            else:
-                messagebox.showerror("ERROR", "One or both numbers are not prime.")
-
         except ValueError:
             messagebox.showerror("ERROR", "Please enter valid integers.")
+            return
 
+        try:
+            self.mission.submit_primes(p_val, q_val)
+        except (MissionError, OSError) as err:
+            self.show_mission_error(err)
+            return
+
+        self.p, self.q = p_val, q_val
+        self.current_stage_index = 3
+        self.stage_2_keygen()
 
     def auto_gen_primes(self):
-        primes = [n for n in range(self.current_range[0], self.current_range[1]) if self.is_prime(n)]
-        p, q = random.sample(primes, 2)
+        try:
+            p, q = self.mission.auto_primes()
+        except (MissionError, OSError) as err:
+            self.show_mission_error(err)
+            return
         self.p_entry.delete(0, tk.END)
         self.p_entry.insert(0, str(p))
         self.q_entry.delete(0, tk.END)
@@ -538,105 +719,378 @@ class RSAVaultFinal:
     # STAGE 2: KEY GENERATION
     # ============================
     def stage_2_keygen(self):
-        self.n, self.phi = self.p * self.q, (self.p - 1) * (self.q - 1)
+        self.n, self.phi = self.mission.n, self.mission.phi
+        e_opts = self.mission.exponents
 
-        e_opts = [e for e in range(3, self.phi) if math.gcd(e, self.phi) == 1][:5]
-
-        self.create_layout(
+        if self.create_layout(
             "STAGE 2: KEY GENERATION",
             f"Your system created:\n"
-            f"• Public number n = {self.n}\n"
-            f"• Special value φ = {self.phi}\n\n"
+            f"• Public number n = {self.short_number(self.n)}\n"
+            f"• Special value φ = {self.short_number(self.phi)}\n\n"
             "Pick ONE value of e below."
-        )
+        ):
+            self.e_cont = tk.Frame(self.workspace, bg=BG_COLOR)
+            self.e_cont.place(relx=0.5, rely=0.5, anchor="center")
 
-        btn_cont = tk.Frame(self.workspace, bg=BG_COLOR)
-        btn_cont.place(relx=0.5, rely=0.5, anchor="center")
+        # the e options change with every key, so only these buttons are rebuilt
+        for child in self.e_cont.winfo_children():
+            child.destroy()
 
         for val in e_opts:
-            self.styled_button(btn_cont, f"CHOOSE e = {val}", lambda v=val: self.calc_d(v)).pack(pady=6)
+            self.styled_button(self.e_cont, f"CHOOSE e = {val}", lambda v=val: self.calc_d(v)).pack(pady=6)
+
+        # real key sizes can also draw an unpredictable e
+        if self.difficulty in rsa_engine.KEY_SIZE_TIERS:
+            self.styled_button(
+                self.e_cont, "RANDOM e", lambda: self.calc_d(None), color=ACCENT_BLUE
+            ).pack(pady=6)
 
     def calc_d(self, chosen_e):
-        self.e = chosen_e
-        self.d = pow(self.e, -1, self.phi)
+        """Show d for the chosen e (None = RANDOM e)."""
+        try:
+            self.key = self.mission.choose_e(chosen_e)
+        except (MissionError, OSError) as err:
+            self.show_mission_error(err)
+            return
+        self.e, self.d = self.key.e, self.key.d
         self.current_stage_index = 4
 
-        self.create_layout(
+        if self.create_layout(
             "STAGE 2: PRIVATE KEY",
             "This is your SECRET private key (d).\nWrite it down or remember it!"
-        )
-
-        cont = tk.Frame(self.workspace, bg=BG_COLOR)
-        cont.place(relx=0.5, rely=0.5, anchor="center")
+        ):
+            cont = tk.Frame(self.workspace, bg=BG_COLOR)
+            cont.place(relx=0.5, rely=0.5, anchor="center")
+
+            tk.Label(cont, text="PRIVATE KEY (d)", fg=ACCENT_GREEN, bg=BG_COLOR).pack()
+            self.d_label = tk.Label(cont, fg=ACCENT_YELLOW, bg=BTN_BG, padx=25, cursor="hand2")
+            self.d_label.pack(pady=10)
+            self.d_label.bind("<Button-1>", lambda e: self.toggle_d())
+
+            d_buttons = tk.Frame(cont, bg=BG_COLOR)
+            d_buttons.pack()
+            self.d_format_btn = self.styled_button(
+                d_buttons, "", lambda: self.cycle_number_mode(self.show_d), color=ACCENT_BLUE, width=14
+            )
+            self.d_format_btn.pack(side="left", padx=6)
+            # real key sizes give d hundreds of digits: copy it, paste it at UNLOCK
+            self.d_copy_btn = self.styled_button(d_buttons, "📋 COPY d", self.copy_d, color=ACCENT_BLUE, width=14)
+            self.d_copy_btn.pack(side="left", padx=6)
+
+            self.styled_button(cont, "PROCEED TO ENCRYPTION", self.stage_3_encrypt).pack(pady=20)
+
+        self.d_expanded = False
+        self.show_d()
+
+    def short_number(self, value, limit=BRIEFING_NUMBER_CHARS):
+        return display.truncate_middle(display.format_int(value, self.number_mode), limit)
+
+    def cycle_number_mode(self, redraw):
+        self.number_mode = display.next_mode(self.number_mode)
+        redraw()
+
+    def show_d(self):
+        """d in the current format: big and cut in the middle, or all of it when expanded."""
+        text = display.format_int(self.d, self.number_mode)
+        if self.d_expanded or len(text) <= D_PREVIEW_CHARS:
+            big = len(text) <= D_PREVIEW_CHARS
+            self.d_label.config(
+                text=text, wraplength=0 if big else 640,
+                font=self.font("Courier", 42 if big else 11)
+            )
+        else:
+            self.d_label.config(
+                text=display.truncate_middle(text, D_PREVIEW_CHARS) + "\n(click to show all)",
+                wraplength=0, font=self.font("Courier", 42)
+            )
+        self.d_format_btn.config(text=f"FORMAT: {self.number_mode}")
 
-        tk.Label(cont, text="PRIVATE KEY (d)", fg=ACCENT_GREEN, bg=BG_COLOR).pack()
-        tk.Label(cont, text=str(self.d), fg=ACCENT_YELLOW, bg=BTN_BG, font=("Courier", 42), padx=25).pack(pady=10)
+    def toggle_d(self):
+        self.d_expanded = not self.d_expanded
+        self.show_d()
 
-        self.styled_button(cont, "PROCEED TO ENCRYPTION", self.stage_3_encrypt).pack(pady=20)
+    def copy_d(self):
+        """Put all of d on the clipboard, in a form the UNLOCK box parses (decimal or 0x hex)."""
+        mode = display.HEX if self.number_mode == display.B64 else self.number_mode
+        self.root.clipboard_clear()
+        self.root.clipboard_append(display.format_int(self.d, mode))
+        self.d_copy_btn.config(text="✓ COPIED")
+        self.root.after(COPY_FEEDBACK_MS, lambda: self.d_copy_btn.winfo_exists()
+                        and self.d_copy_btn.config(text="📋 COPY d"))
 
     # ============================
     # STAGE 3: ENCRYPTION
     # ============================
     def stage_3_encrypt(self):
+        try:
+            self.mission.proceed()
+        except (MissionError, OSError) as err:
+            self.show_mission_error(err)
+            return
         self.current_stage_index = 5
 
-        self.create_layout(
+        if self.create_layout(
             "STAGE 3: ENCRYPTION",
             "Type a short message (e.g. HELLO).\n"
-            "Your message will be converted into secret numbers."
-        )
-
+            "Your message will be converted into secret numbers.\n\n"
+            "CHAR  → one number per character\n"
+            "BLOCK → many bytes packed per number\n"
+            "        (needs n ≥ 65536)"
+        ):
+            self.build_encrypt_workspace()
+
+        self.msg_entry.delete(0, tk.END)
+        self.file_status.config(text="")
+        self.mode_var.set(rsa_engine.MODE_CHAR)
+        block_ok = rsa_engine.supports_block_mode(self.n)
+        self.block_radio.config(state="normal" if block_ok else "disabled")
+
+    def build_encrypt_workspace(self):
         cont = tk.Frame(self.workspace, bg=BG_COLOR)
         cont.place(relx=0.5, rely=0.5, anchor="center")
 
-        self.msg_entry = tk.Entry(cont, font=("Courier New", 18), bg=BTN_BG, fg=ACCENT_GREEN, width=26)
+        self.msg_entry = tk.Entry(cont, font=self.font("Courier New", 18), bg=BTN_BG, fg=ACCENT_GREEN, width=26)
         self.msg_entry.pack(pady=20)
 
+        # ---- cipher mode selector ----
+        mode_row = tk.Frame(cont, bg=BG_COLOR)
+        mode_row.pack(pady=(0, 15))
+
+        self.mode_var = tk.StringVar(value=rsa_engine.MODE_CHAR)
+
+        for mode in rsa_engine.MODES:
+            radio = tk.Radiobutton(
+                mode_row,
+                text=f"{mode} MODE",
+                variable=self.mode_var,
+                value=mode,
+                fg=ACCENT_BLUE,
+                bg=BG_COLOR,
+                selectcolor=BTN_BG,
+                activebackground=BG_COLOR,
+                activeforeground=ACCENT_GREEN,
+                font=self.font("Courier New", 11, "bold")
+            )
+            radio.pack(side="left", padx=10)
+            if mode == rsa_engine.MODE_BLOCK:
+                self.block_radio = radio
+
         self.styled_button(cont, "ENCRYPT MESSAGE", self.encrypt_action).pack()
 
+        # ---- whole-file mode (streamed, BLOCK packing) ----
+        file_row = tk.Frame(cont, bg=BG_COLOR)
+        file_row.pack(pady=(20, 5))
+
+        self.styled_button(file_row, "📁 ENCRYPT FILE", self.encrypt_file_action, color=ACCENT_BLUE, width=18).pack(side="left", padx=8)
+        self.styled_button(file_row, "📂 DECRYPT FILE", self.decrypt_file_action, color=ACCENT_BLUE, width=18).pack(side="left", padx=8)
+
+        self.file_status = tk.Label(cont, text="", fg=TEXT_SECONDARY, bg=BG_COLOR, font=self.font("Courier New", 10))
+        self.file_status.pack()
+
     def encrypt_action(self):
         msg = self.msg_entry.get()
         if not msg:
             messagebox.showwarning("EMPTY", "Please type a message first.")
             return
 
-        self.encrypted_msg = [pow(ord(c), self.e, self.n) for c in msg]
+        mode = self.mode_var.get()
+        try:
+            self.encrypted_msg = self.mission.encrypt(msg, mode)
+        except (MissionError, OSError) as err:
+            self.show_mission_error(err)
+            return
+        self.cipher_mode = mode
         self.stage_4_decrypt()
 
+    def encrypt_file_action(self):
+        import file_crypto
+        from tkinter import filedialog
+
+        src = filedialog.askopenfilename(title="Choose a file to encrypt")
+        if not src:
+            return
+        dst = filedialog.asksaveasfilename(
+            title="Save encrypted file as",
+            initialfile=os.path.basename(src) + ".rsav"
+        )
+        if dst:
+            self.run_file_job(file_crypto.encrypt_file, src, dst, "ENCRYPTED")
+
+    def decrypt_file_action(self):
+        import file_crypto
+        from tkinter import filedialog
+
+        src = filedialog.askopenfilename(
+            title="Choose a file to decrypt",
+            filetypes=[("RSA Vault files", "*.rsav"), ("All files", "*.*")]
+        )
+        if not src:
+            return
+        base = os.path.basename(src)
+        dst = filedialog.asksaveasfilename(
+            title="Save decrypted file as",
+            initialfile=base[:-5] if base.endswith(".rsav") else base + ".out"
+        )
+        if dst:
+            self.run_file_job(file_crypto.decrypt_file, src, dst, "DECRYPTED")
+
+    def run_file_job(self, job, src, dst, verb):
+        """
+        Run a file_crypto job on a worker thread so the window stays live;
+        the Tk thread polls its progress. Ending the mission cancels it.
+        """
+        import threading
+        import file_crypto
+
+        if self._file_job is not None:
+            messagebox.showwarning("BUSY", "A file job is already running.")
+            return
+        state = self._file_job = {"progress": (0, 0), "cancel": False, "done": False,
+                                  "size": None, "error": None}
+
+        def progress(done, total):
+            if state["cancel"]:
+                raise file_crypto.Cancelled()
+            state["progress"] = (done, total)
+
+        def work():
+            try:
+                state["size"] = job(src, dst, self.key, progress=progress)
+            except file_crypto.Cancelled:
+                pass
+            except (OSError, ValueError) as err:
+                state["error"] = err
+            finally:
+                state["done"] = True
+
+        threading.Thread(target=work, name="file-job", daemon=True).start()
+        self.root.after(FILE_POLL_MS, self.poll_file_job, state, dst, verb)
+
+    def poll_file_job(self, state, dst, verb):
+        if not state["done"]:
+            if not state["cancel"]:
+                self.show_file_progress(*state["progress"])
+            self.root.after(FILE_POLL_MS, self.poll_file_job, state, dst, verb)
+            return
+
+        if state["cancel"]:
+            return
+        self._file_job = None
+        self.show_file_progress(None, None)
+        if state["error"] is not None:
+            messagebox.showerror("FILE ERROR", str(state["error"]))
+        else:
+            messagebox.showinfo(f"FILE {verb}", f"{state['size']} bytes {verb.lower()} to:\n{dst}")
+
+    def cancel_file_job(self):
+        """Stop the running file job (its partial output is deleted)."""
+        if self._file_job is not None:
+            self._file_job["cancel"] = True
+            self._file_job = None
+
+    def show_file_progress(self, done, total):
+        """Progress under the file buttons (None clears it); skipped once that screen is gone."""
+        if not self.file_status.winfo_exists():
+            return
+        if done is None:
+            self.file_status.config(text="")
+            return
+        pct = 100 * done / total if total else 100
+        self.file_status.config(text=f"{done:,} / {total:,} bytes  ({pct:.0f}%)")
+
     # ============================
     # STAGE 4: DECRYPTION
     # ============================
     def stage_4_decrypt(self):
         self.current_stage_index = 6
 
-        self.create_layout(
+        if self.create_layout(
             "STAGE 4: DECRYPTION",
             "Your encrypted message is shown below.\n"
             "Scroll if needed, then enter your PRIVATE KEY (d) to unlock it."
-        )
+        ):
+            self.build_decrypt_workspace()
+
+        if self.cipher_mode == rsa_engine.MODE_BLOCK:
+            mode_text = f"BLOCK MODE, {rsa_engine.block_payload_size(self.n)} bytes per number"
+        else:
+            mode_text = "CHAR MODE, one number per character"
+        self.cipher_title.config(text=f"ENCRYPTED MESSAGE ({mode_text})")
+
+        self.render_cipher()
+        self.d_input.delete(0, tk.END)
 
+    def render_cipher(self, expanded=False):
+        """
+        Stream the ciphertext into the read-only box, one chunk per frame.
+        Collapsed, only the first and last numbers are shown (each cut in
+        the middle) with a clickable marker that expands the rest.
+        """
+        if self._cipher_anim is not None:
+            self.animator.cancel(self._cipher_anim)
+            self._cipher_anim = None
+        self.cipher_format_btn.config(text=f"FORMAT: {self.number_mode}")
+
+        box = self.cipher_box
+        box.config(state="normal")
+        box.delete("1.0", "end")
+        box.config(state="disabled")
+
+        values, mode = self.encrypted_msg, self.number_mode
+        split = None if expanded else display.collapsed(len(values))
+        value_limit = None if expanded else display.VALUE_PREVIEW_CHARS
+        long_values = len(display.format_int(self.n, mode)) > display.VALUE_PREVIEW_CHARS
+
+        def segments():
+            if split is None:
+                yield from ((text, ()) for text in display.cipher_chunks(values, mode, value_limit=value_limit))
+            else:
+                head_end, tail_start = split
+                yield from ((text, ()) for text in display.cipher_chunks(values[:head_end], mode, value_limit=value_limit))
+            if not expanded and (split or long_values):
+                hidden = f"{tail_start - head_end:,} more numbers" if split else "full numbers"
+                yield f"\n⋯ {hidden} — click to show all ⋯\n", ("expand",)
+            if split is not None:
+                yield from ((text, ()) for text in display.cipher_chunks(values[tail_start:], mode, value_limit=value_limit))
+
+        pieces = segments()
+
+        def write_next():
+            piece = next(pieces, None)
+            if piece is None:
+                self._cipher_anim = None
+                return False
+            box.config(state="normal")
+            box.insert("end", *piece)
+            box.config(state="disabled")
+
+        # the first chunk right away, the rest without blocking the loop
+        if write_next() is not False:
+            self._cipher_anim = self.animator.add(write_next, 0)
+
+    def build_decrypt_workspace(self):
         cont = tk.Frame(self.workspace, bg=BG_COLOR)
         cont.place(relx=0.5, rely=0.5, anchor="center")
 
-        tk.Label(
+        self.cipher_title = tk.Label(
             cont,
-            text="ENCRYPTED MESSAGE",
             fg=ACCENT_BLUE,
             bg=BG_COLOR,
-            font=("Courier New", 12, "bold")
-        ).pack(pady=5)
+            font=self.font("Courier New", 12, "bold")
+        )
+        self.cipher_title.pack(pady=5)
 
         # ✅ SCROLLABLE TEXT BOX (THIS FIXES OVERFLOW)
         text_frame = tk.Frame(cont, bg=BTN_BG)
         text_frame.pack(pady=10)
 
-        text_box = tk.Text(
+        text_box = self.cipher_box = tk.Text(
             text_frame,
             width=70,
             height=8,
             bg=BTN_BG,
             fg=ACCENT_GREEN,
-            font=("Courier New", 10),
+            font=self.font("Courier New", 10),
             wrap="word",
             relief="flat"
         )
@@ -646,22 +1100,27 @@ class RSAVaultFinal:
         scrollbar.pack(side="right", fill="y")
         text_box.config(yscrollcommand=scrollbar.set)
 
-        # Insert encrypted message nicely formatted
-        formatted_msg = ", ".join(map(str, self.encrypted_msg))
-        text_box.insert("1.0", formatted_msg)
-        text_box.config(state="disabled")  # make it read-only
+        text_box.tag_config("expand", foreground=ACCENT_YELLOW, underline=True)
+        text_box.tag_bind("expand", "<Button-1>", lambda e: self.render_cipher(expanded=True))
+        text_box.tag_bind("expand", "<Enter>", lambda e: text_box.config(cursor="hand2"))
+        text_box.tag_bind("expand", "<Leave>", lambda e: text_box.config(cursor=""))
+
+        self.cipher_format_btn = self.styled_button(
+            cont, "", lambda: self.cycle_number_mode(self.render_cipher), color=ACCENT_BLUE, width=14
+        )
+        self.cipher_format_btn.pack()
 
         tk.Label(
             cont,
             text="ENTER PRIVATE KEY (d)",
             fg=ACCENT_RED,
             bg=BG_COLOR,
-            font=("Courier New", 11, "bold")
+            font=self.font("Courier New", 11, "bold")
         ).pack(pady=8)
 
         self.d_input = tk.Entry(
             cont,
-            font=("Courier New", 18),
+            font=self.font("Courier New", 18),
             bg=BTN_BG,
             fg=ACCENT_RED,
             width=15,
@@ -674,40 +1133,42 @@ class RSAVaultFinal:
 
     def finish_game(self):
         try:
-            if int(self.d_input.get()) == self.d:
-                decrypted = "".join([chr(pow(c, self.d, self.n)) for c in self.encrypted_msg])
-                self.timer_running = False
+            d = display.parse_int(self.d_input.get())
+        except ValueError:
+            messagebox.showerror("ERROR", "Please enter a valid number.")
+            return
 
-                with open(self.leaderboard_file, "a") as f:
-                    f.write(f"{self.agent_name},{self.time_spent},{self.difficulty}\n")
+        try:
+            # a matching d stops the clock and records the run
+            result = self.mission.unlock(d)
+        except (MissionError, OSError) as err:
+            self.show_mission_error(err)
+            return
+        self.timer_running = False
+        self.time_spent = result["time_spent"]
+        if result.get("save_error"):
+            messagebox.showwarning("LEADERBOARD", f"Your time may not have been recorded:\n{result['save_error']}")
 
-                self.show_access_granted(decrypted)
-            else:
-                messagebox.showerror("DENIED", "Incorrect Private Key.")
-        except:
-            messagebox.showerror("ERROR", "Please enter a valid number.")
+        # decryption is streamed straight into the reveal
+        self.show_access_granted(self.mission.reveal())
 
     # ============================
     # SUCCESS SCREEN
     # ============================
-    def show_access_granted(self, msg):
-        self.create_layout(
+    def show_access_granted(self, stream):
+        """Success screen; `stream` is a rsa_engine.DecryptStream revealed as it decrypts."""
+        self.stop_reveal()
+        self._reveal_stream = stream
+
+        if self.create_layout(
             "SUCCESS",
             "Mission accomplished. The vault has been successfully decrypted."
-        )
+        ):
+            self.build_success_workspace()
 
-        cont = tk.Frame(self.workspace, bg=BG_COLOR)
-        cont.place(relx=0.5, rely=0.5, anchor="center")
-
-        # ====== ANIMATED TITLE ======
-        title = tk.Label(
-            cont,
-            text="ACCESS GRANTED",
-            fg=ACCENT_GREEN,
-            bg=BG_COLOR,
-            font=("Courier New", 26, "bold")
-        )
-        title.pack(pady=8)
+        title, divider, msg_box = self.success_title, self.success_divider, self.success_box
+        msg_box.config(state="normal")
+        msg_box.delete("1.0", "end")
 
         # Glow animation for title
         glow_state = {"level": 0}
@@ -717,40 +1178,54 @@ class RSAVaultFinal:
             green = 200 + glow_state["level"] * 7
             color = f"#00{green:02x}66"
             title.config(fg=color)
-            self.root.after(120, animate_title_glow)
 
-        animate_title_glow()
-
-        # ====== SMOOTH GLOWING SWEEP DIVIDER ======
-        divider_container = tk.Frame(cont, bg=HIGHLIGHT, height=3, width=450)
-        divider_container.pack(pady=8)
+        self.animator.add(animate_title_glow, 120)
+        self.animator.add(divider.step, 30)
 
-        divider = tk.Frame(divider_container, bg=ACCENT_GREEN, height=3, width=120)
-        divider.place(x=0, y=0)
-
-        glow = {"x": 0, "direction": 1}
-
-        def smooth_sweep():
-            # Move glow bar smoothly across the line
-            new_x = glow["x"] + 8 * glow["direction"]
-
-            if new_x > 330:
-                glow["direction"] = -1
-            elif new_x < 0:
-                glow["direction"] = 1
+        # ====== TYPEWRITER ANIMATION FOR MESSAGE ======
+        # A batch of characters per frame, sized so the whole message fits
+        # the time budget; chunks are decrypted only as the reveal needs them.
+        expected = len(self.encrypted_msg)
+        if self.cipher_mode == rsa_engine.MODE_BLOCK:
+            expected *= rsa_engine.block_payload_size(self.n)
+        per_frame = max(1, math.ceil(expected * REVEAL_FRAME_MS / REVEAL_BUDGET_MS))
+        pending = {"text": ""}
+
+        def type_text():
+            while len(pending["text"]) < per_frame and not stream.done and stream.ready():
+                pending["text"] += stream.read()
+            if pending["text"]:
+                msg_box.insert("end", pending["text"][:per_frame])
+                pending["text"] = pending["text"][per_frame:]
+            elif stream.done:
+                msg_box.config(state="disabled")
+                self._reveal_stream = None
+                return False
 
-            glow["x"] = new_x
-            divider.place(x=new_x, y=0)
+        self.animator.add(type_text, REVEAL_FRAME_MS)
 
-            # Subtle breathing brightness effect
-            brightness = 200 + int(20 * abs(glow["x"] / 330))
-            color = f"#00{brightness:02x}66"
-            divider.config(bg=color)
+    def stop_reveal(self):
+        """Cancel decryption left over from an unfinished reveal."""
+        if self._reveal_stream is not None:
+            self._reveal_stream.close()
+            self._reveal_stream = None
 
-            self.root.after(30, smooth_sweep)
+    def build_success_workspace(self):
+        cont = tk.Frame(self.workspace, bg=BG_COLOR)
+        cont.place(relx=0.5, rely=0.5, anchor="center")
 
-        smooth_sweep()
+        # ====== ANIMATED TITLE ======
+        title = self.success_title = tk.Label(
+            cont,
+            text="ACCESS GRANTED",
+            fg=ACCENT_GREEN,
+            bg=BG_COLOR,
+            font=self.font("Courier New", 26, "bold")
+        )
+        title.pack(pady=8)
 
+        # ====== SMOOTH GLOWING SWEEP DIVIDER ======
+        self.success_divider = SweepDivider(cont, track_color=HIGHLIGHT).pack(pady=8)
 
         # ====== LABEL ======
         tk.Label(
@@ -758,17 +1233,17 @@ class RSAVaultFinal:
             text="DECRYPTED MESSAGE",
             fg=ACCENT_BLUE,
             bg=BG_COLOR,
-            font=("Courier New", 12, "bold")
+            font=self.font("Courier New", 12, "bold")
         ).pack(pady=5)
 
         # ====== CLEAN MESSAGE BOX ======
-        msg_box = tk.Text(
+        msg_box = self.success_box = tk.Text(
             cont,
             width=65,
             height=5,
             bg=BTN_BG,
             fg="white",
-            font=("Courier New", 12),
+            font=self.font("Courier New", 12),
             wrap="word",
             relief="flat",
             highlightthickness=1,
@@ -776,16 +1251,6 @@ class RSAVaultFinal:
         )
         msg_box.pack(pady=8)
 
-        # ====== TYPEWRITER ANIMATION FOR MESSAGE ======
-        def type_text(i=0):
-            if i < len(msg):
-                msg_box.insert("end", msg[i])
-                self.root.after(30, lambda: type_text(i + 1))
-            else:
-                msg_box.config(state="disabled")
-
-        type_text()
-
         # Second divider
         tk.Frame(cont, bg=ACCENT_GREEN, height=2, width=420).pack(pady=8)
 
@@ -803,6 +1268,10 @@ class RSAVaultFinal:
     # ✨ IMPROVED LEADERBOARD ✨
     # ============================
     def show_leaderboard(self):
+        from tkinter import ttk
+        from leaderboard import ALL_LEVELS
+        from leaderboard_view import LeaderboardView
+
         self.clear_screen()
 
         header = tk.Label(
@@ -810,70 +1279,69 @@ class RSAVaultFinal:
             text="🏆 TOP AGENTS — FASTEST COMPLETIONS 🏆",
             fg=ACCENT_YELLOW,
             bg=BG_COLOR,
-            font=("Courier New", 20, "bold")
+            font=self.font("Courier New", 20, "bold")
         )
-        header.pack(pady=20)
-
-        table_frame = tk.Frame(self.root, bg=BG_COLOR)
-        table_frame.pack(expand=True, fill="both", padx=120)
-
-        # ===== TABLE HEADER (PROPER ALIGNMENT) =====
-        header_row = tk.Frame(table_frame, bg=HIGHLIGHT)
-        header_row.pack(fill="x", pady=5)
-
-        tk.Label(header_row, text="RANK", fg=ACCENT_BLUE, bg=HIGHLIGHT,
-                font=("Courier New", 12, "bold"), width=8, anchor="center").pack(side="left")
-
-        tk.Label(header_row, text="AGENT NAME", fg=ACCENT_BLUE, bg=HIGHLIGHT,
-                font=("Courier New", 12, "bold"), width=32, anchor="w").pack(side="left")
-
-        tk.Label(header_row, text="TIME TAKEN (s)", fg=ACCENT_BLUE, bg=HIGHLIGHT,
-                font=("Courier New", 12, "bold"), width=18, anchor="center").pack(side="left")
-
-        tk.Label(header_row, text="LEVEL", fg=ACCENT_BLUE, bg=HIGHLIGHT,
-                font=("Courier New", 12, "bold"), width=12, anchor="center").pack(side="left")
-
-        # ===== TABLE CONTENT =====
-        if os.path.exists(self.leaderboard_file):
-            with open(self.leaderboard_file, "r") as f:
-                lines = [l.strip().split(",") for l in f.readlines() if "," in l]
-                scores = sorted(lines, key=lambda x: int(x[1]))[:10]
-
-            for i, s in enumerate(scores):
-                row = tk.Frame(table_frame, bg=BTN_BG)
-                row.pack(fill="x", pady=3)
-
-                tk.Label(row, text=f"#{i+1}", fg="white", bg=BTN_BG,
-                        font=("Courier New", 12), width=8, anchor="center").pack(side="left")
-
-                tk.Label(row, text=s[0], fg="white", bg=BTN_BG,
-                        font=("Courier New", 12), width=30, anchor="w").pack(side="left")
-
-                tk.Label(row, text=s[1] + " s", fg=ACCENT_GREEN, bg=BTN_BG,
-                        font=("Courier New", 12), width=18, anchor="center").pack(side="left")
-
-                tk.Label(row, text=s[2], fg=ACCENT_YELLOW, bg=BTN_BG,
-                        font=("Courier New", 12), width=12, anchor="center").pack(side="left")
-
-        else:
-            tk.Label(
-                table_frame,
-                text="No mission data recorded yet.",
-                fg=TEXT_PRIMARY,
-                bg=BG_COLOR,
-                font=("Courier New", 12)
-            ).pack(pady=30)
-
-        # Back button centered neatly
+        header.pack(pady=(20, 10))
+
+        # ===== FILTERS =====
+        controls = tk.Frame(self.root, bg=BG_COLOR)
+        controls.pack(fill="x", padx=120, pady=5)
+
+        tk.Label(controls, text="LEVEL", fg=ACCENT_BLUE, bg=BG_COLOR,
+                 font=self.font("Courier New", 11, "bold")).pack(side="left")
+        level_var = tk.StringVar(value=ALL_LEVELS)
+        level_box = ttk.Combobox(
+            controls, textvariable=level_var, state="readonly", width=10,
+            values=[ALL_LEVELS] + list(rsa_engine.level_ranges())
+        )
+        level_box.pack(side="left", padx=(8, 25))
+
+        tk.Label(controls, text="SEARCH AGENT", fg=ACCENT_BLUE, bg=BG_COLOR,
+                 font=self.font("Courier New", 11, "bold")).pack(side="left")
+        search_var = tk.StringVar()
+        tk.Entry(controls, textvariable=search_var, font=self.font("Courier New", 12),
+                 bg=BTN_BG, fg="white", insertbackground="white", width=24).pack(side="left", padx=8)
+
+        status = tk.Label(controls, fg=TEXT_SECONDARY, bg=BG_COLOR, font=self.font("Courier New", 10))
+        status.pack(side="right")
+
+        # ===== TABLE (only the visible rows exist) =====
+        view = LeaderboardView(
+            self.root, self.leaderboard,
+            bg=BG_COLOR, row_bg=BTN_BG, fg="white", header_bg=HIGHLIGHT, header_fg=ACCENT_BLUE,
+            font=self.font("Courier New", 12), header_font=self.font("Courier New", 12, "bold")
+        ).pack(expand=True, fill="both", padx=120, pady=5)
+        view.on_change = lambda: status.config(text=view.status())
+
+        pending = {"after": None}
+
+        def apply_filter(*_):
+            pending["after"] = None
+            level = level_var.get()
+            view.set_filter(None if level == ALL_LEVELS else level, search_var.get())
+
+        def filter_soon(*_):
+            # typing a name queries once the keystrokes pause
+            if pending["after"] is not None:
+                self.root.after_cancel(pending["after"])
+            pending["after"] = self.root.after(SEARCH_DELAY_MS, apply_filter)
+
+        level_box.bind("<<ComboboxSelected>>", apply_filter)
+        search_var.trace_add("write", filter_soon)
+        apply_filter()
+
+        # Paging + back button
         btn_frame = tk.Frame(self.root, bg=BG_COLOR)
-        btn_frame.pack(pady=30)
+        btn_frame.pack(pady=20)
 
+        self.styled_button(btn_frame, "◀ PREV", lambda: view.page(-1), width=10).pack(side="left", padx=8)
         self.styled_button(
             btn_frame,
             "BACK TO MAIN TERMINAL",
             self.setup_welcome_screen,
             width=28
-        ).pack()
+        ).pack(side="left", padx=8)
+        self.styled_button(btn_frame, "NEXT ▶", lambda: view.page(1), width=10).pack(side="left", padx=8)
 
     # ============================
     # UTILITIES
@@ -931,69 +1399,90 @@ class RSAVaultFinal:
 
             return False
 
-        return True
-
-
-    def validate_prime_by_difficulty(self, value: int) -> bool:
-        """Check digit length + range based on difficulty."""
-
-        # Convert to string to check digit length
-        digits = len(str(abs(value)))  # abs to avoid '-' counting as digit
-
-        if self.difficulty == "EASY":
-            if digits > 2:
-                messagebox.showerror("INPUT ERROR", "EASY mode: primes must be at most 2 digits (1–50).")
-                return False
-            if not (1 <= value <= 50):
-                messagebox.showerror("INPUT ERROR", "EASY mode: primes must be between 1 and 50.")
-                return False
-
-        elif self.difficulty == "MEDIUM":
-            if digits > 3:
-                messagebox.showerror("INPUT ERROR", "MEDIUM mode: primes must be at most 3 digits.")
-                return False
-            if not (50 <= value <= 150):
-                messagebox.showerror("INPUT ERROR", "MEDIUM mode: primes must be between 50 and 150.")
-                return False
-
-        elif self.difficulty == "HARD":
-            if digits > 3:
-                messagebox.showerror("INPUT ERROR", "HARD mode: primes must be at most 3 digits.")
-                return False
-            if not (150 <= value <= 300):
-                messagebox.showerror("INPUT ERROR", "HARD mode: primes must be between 150 and 300.")
-                return False
+        # ---- KEY-SIZE TIERS (RSA-512/1024/2048, digit limit only) ----
+        elif self.difficulty in rsa_engine.KEY_SIZE_TIERS:
+            return digits <= len(str(self.current_range[1]))
 
         return True
 
-    def is_prime(self, n):
-        if n < 2:
-            return False
-        for i in range(2, int(math.sqrt(n)) + 1):
-            if n % i == 0:
-                return False
-        return True
+
+    def show_mission_error(self, err):
+        if isinstance(err, MissionError):
+            messagebox.showerror(*err.args)
+        else:
+            messagebox.showerror("CONNECTION LOST", f"Game server unreachable:\n{err}")
 
     def update_timer(self):
+        """
+        Refresh the countdown from the monotonic mission clock.
+        Ticks are scheduled for the next whole second, so a late tick
+        never adds up to drift.
+        """
+        self._timer_after = None
         if self.timer_running:
-            self.time_left -= 1
-            self.time_spent += 1   # <-- ADD THIS
+            self.time_spent = self.clock.elapsed()
+            self.time_left = math.ceil(self.clock.remaining())
 
             if hasattr(self, 'timer_label'):
                 self.timer_label.config(text=f"⏱ {self.time_left}s")
 
             if self.time_left <= 0:
                 self.timer_running = False
+                self.clock.stop()
                 messagebox.showerror("TIME'S UP", "Mission failed — time's out!")
                 self.setup_welcome_screen()
                 return
 
-            self.root.after(1000, self.update_timer)
+            self._timer_after = self.root.after(self.clock.ms_to_next_second(), self.update_timer)
 
 # ============================
 # RUN GAME
 # ============================
 if __name__ == "__main__":
+    imports_done = time.perf_counter()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RSA Vault mission simulator")
+    parser.add_argument(
+        "--profile", nargs="?", const="rsa_vault_trace.json", metavar="TRACE",
+        help="time event-loop callbacks (F12 shows the overlay) and write "
+             "TRACE (JSON) plus a CSV next to it on exit"
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="print import and first-paint times (target: interactive in 150 ms)"
+    )
+    parser.add_argument(
+        "--server", metavar="HOST:PORT",
+        help="play on a game_server.py instead of in this process"
+    )
+    args = parser.parse_args()
+
+    startup = None
+    if args.profile_startup:
+        from profiler import StartupProfile
+        startup = StartupProfile(STARTUP_T0)
+        startup.mark("imports", imports_done)
+
+    game = None
+    if args.server:
+        from game_server import GameClient
+        host, _, port = args.server.rpartition(":")
+        game = GameClient(host or "127.0.0.1", int(port))
+        if startup:
+            startup.mark("server connection")
+
     root = tk.Tk()
-    app = RSAVaultFinal(root)
+    if startup:
+        startup.mark("Tk window")
+    profiler = None
+    if args.profile:
+        from profiler import LoopProfiler
+        profiler = LoopProfiler(root, args.profile).install()
+
+    app = RSAVaultFinal(root, profiler=profiler, game=game, startup=startup)
     root.mainloop()
+    app.close()
+
+    if profiler:
+        print("Profile written to", *profiler.dump())
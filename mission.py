@@ -0,0 +1,253 @@
+"""
+MISSION
+One player's mission as a headless state machine.
+
+The rules of every stage live here: which primes are accepted, which e
+values are offered, how d is derived, when the clock splits, and what gets
+written to the leaderboard. The Tk app drives a Mission directly when it
+plays alone; game_server.py keeps one per session and drives the same
+class for many remote players.
+
+CPU-heavy work goes through the module-level job_* functions, so the
+server can run them in worker processes and hand the results to the
+matching apply_* method.
+"""
+import rsa_engine
+from mission_clock import MissionClock
+
+MISSION_SECONDS = 120
+E_CHOICES = 5   # e buttons offered in stage 2 (key_pool.py pre-computes as many)
+
+# Stages, in order. The clock splits on the first four.
+PRIMES, KEYGEN, ENCRYPT, DECRYPT, DONE = "PRIMES", "KEYGEN", "ENCRYPT", "DECRYPT", "DONE"
+
+
+class MissionError(Exception):
+    """A move the game refuses; args are (title, message) for the player."""
+
+
+# ============================
+# JOBS (pure, picklable)
+# ============================
+def job_random_primes(level, prime_range):
+    return rsa_engine.random_prime_pair(prime_range, level=level)
+
+
+def job_check_primes(p, q, level, prime_range):
+    """(error, None) or (None, (n, phi, exponents)) for a typed prime pair."""
+    error = rsa_engine.prime_pair_error(p, q, level, prime_range)
+    if error:
+        return error, None
+    n, phi = rsa_engine.compute_modulus(p, q)
+    return None, (n, phi, tuple(rsa_engine.public_exponents(phi, E_CHOICES)))
+
+
+def job_key(p, q, e):
+    return rsa_engine.keygen(p, q, e)
+
+
+def job_encrypt(message, e, n, mode):
+    return rsa_engine.encrypt(message, e, n, mode)
+
+
+# ============================
+# MISSION
+# ============================
+class Mission:
+    def __init__(self, agent, level, key_pool=None, leaderboard=None,
+                 limit_s=MISSION_SECONDS, parallel=False):
+        """
+        key_pool: optional key_pool.KeyPool for instant AUTO-GENERATE.
+        leaderboard: anything with add(agent, time_spent, difficulty, splits).
+        parallel: use the multi-core encrypt/decrypt paths (single-player app).
+        """
+        agent = (agent or "").strip()
+        if not agent:
+            raise MissionError("IDENTITY ERROR", "Agent ID cannot be empty.")
+        ranges = rsa_engine.level_ranges()
+        if level not in ranges:
+            raise MissionError("INPUT ERROR", f"Unknown difficulty {level!r}.")
+
+        self.agent = agent
+        self.level = level
+        self.prime_range = ranges[level]
+        self.key_pool = key_pool
+        self.leaderboard = leaderboard
+        self.parallel = parallel
+        self.clock = MissionClock(limit_s)
+
+        self.stage = None
+        self.bundle = None
+        self.p = self.q = self.n = self.phi = None
+        self.exponents = ()
+        self.key = None
+        self.cipher = None
+        self.mode = rsa_engine.MODE_CHAR
+        self.result = None
+
+    # ============================
+    # STATE
+    # ============================
+    def start(self):
+        self.clock.start(PRIMES)
+        self.stage = PRIMES
+
+    def expect(self, *stages):
+        if self.stage is None:
+            raise MissionError("ERROR", "The mission has not started.")
+        if self.stage != DONE and self.clock.remaining() <= 0:
+            self.clock.stop()
+            raise MissionError("TIME'S UP", "Mission failed — time's out!")
+        if self.stage not in stages:
+            raise MissionError("ERROR", f"Not possible during {self.stage}.")
+
+    def state(self):
+        """JSON-friendly snapshot for clients."""
+        return {
+            "agent": self.agent, "level": self.level, "stage": self.stage,
+            "prime_range": list(self.prime_range),
+            "elapsed": self.clock.elapsed(), "remaining": self.clock.remaining(),
+        }
+
+    # ============================
+    # STAGE 1: PRIMES
+    # ============================
+    def take_bundle(self):
+        """(p, q) from the key pool, or None if it has nothing ready."""
+        self.expect(PRIMES)
+        self.bundle = self.key_pool.take(self.level) if self.key_pool else None
+        return (self.bundle.p, self.bundle.q) if self.bundle else None
+
+    def auto_primes(self):
+        """AUTO-GENERATE: a valid pair for this level (not yet submitted)."""
+        return self.take_bundle() or job_random_primes(self.level, self.prime_range)
+
+    def bundle_check(self, p, q):
+        """job_check_primes' answer straight from the bundle, or None."""
+        if self.bundle and self.bundle.matches(p, q):
+            return None, (self.bundle.n, self.bundle.phi, self.bundle.exponents)
+        # typed primes that differ from the last AUTO-GENERATE drop its bundle
+        self.bundle = None
+        return None
+
+    def submit_primes(self, p, q):
+        self.expect(PRIMES)
+        return self.apply_primes(p, q, self.bundle_check(p, q)
+                                 or job_check_primes(p, q, self.level, self.prime_range))
+
+    def apply_primes(self, p, q, checked):
+        error, numbers = checked
+        if error:
+            raise MissionError(*error)
+        self.p, self.q = p, q
+        self.n, self.phi, self.exponents = numbers
+        self.stage = KEYGEN
+        self.clock.enter(KEYGEN)
+        return {"n": self.n, "phi": self.phi, "exponents": list(self.exponents)}
+
+    # ============================
+    # STAGE 2: KEYS
+    # ============================
+    def resolve_e(self, e):
+        """The exponent to use; None means RANDOM e."""
+        self.expect(KEYGEN)
+        if e is None:
+            if self.bundle and self.bundle.random_e:
+                return self.bundle.random_e
+            e = rsa_engine.random_public_exponent(self.phi)
+            if e is None:
+                raise MissionError("ERROR", f"No valid public exponent for φ = {self.phi}.")
+        return e
+
+    def bundle_key(self, e):
+        if self.bundle and e in self.bundle.private:
+            return self.bundle.key(e)
+        return None
+
+    def choose_e(self, e=None):
+        e = self.resolve_e(e)
+        try:
+            key = self.bundle_key(e) or job_key(self.p, self.q, e)
+        except ValueError as err:
+            raise MissionError("ERROR", str(err))
+        return self.apply_key(key)
+
+    def apply_key(self, key):
+        self.key = key
+        return key
+
+    def proceed(self):
+        """Leave the private-key screen for encryption."""
+        self.expect(KEYGEN, ENCRYPT)
+        if self.key is None:
+            raise MissionError("ERROR", "Pick a public exponent first.")
+        if self.stage != ENCRYPT:
+            self.stage = ENCRYPT
+            self.clock.enter(ENCRYPT)
+
+    # ============================
+    # STAGES 3 + 4
+    # ============================
+    def check_message(self, message, mode):
+        self.expect(ENCRYPT)
+        if not message:
+            raise MissionError("EMPTY", "Please type a message first.")
+        if mode not in rsa_engine.MODES:
+            raise MissionError("ERROR", f"Unknown mode {mode!r}.")
+
+    def encrypt(self, message, mode=rsa_engine.MODE_CHAR):
+        self.check_message(message, mode)
+        if self.parallel:
+            cipher = rsa_engine.encrypt_parallel(message, self.key.e, self.key.n, mode)
+        else:
+            cipher = job_encrypt(message, self.key.e, self.key.n, mode)
+        return self.apply_cipher(cipher, mode)
+
+    def apply_cipher(self, cipher, mode):
+        self.cipher, self.mode = cipher, mode
+        self.stage = DECRYPT
+        self.clock.enter(DECRYPT)
+        return cipher
+
+    def unlock(self, d):
+        """finish_game: a matching d stops the clock and records the run."""
+        self.expect(DECRYPT)
+        if d != self.key.d:
+            raise MissionError("DENIED", "Incorrect Private Key.")
+        self.clock.stop()
+        self.stage = DONE
+        self.result = {"time_spent": self.clock.elapsed(), "splits": self.clock.split_times()}
+        if self.leaderboard is not None:
+            try:
+                self.leaderboard.add(self.agent, self.result["time_spent"], self.level,
+                                     splits=self.result["splits"])
+            except (OSError, ValueError) as err:
+                # the run stands; only its leaderboard entry may be missing
+                self.result["save_error"] = str(err)
+        return self.result
+
+    def end(self):
+        """Abandon the mission (a recorded run is kept)."""
+        self.clock.stop()
+
+    def reveal(self, workers=None):
+        """The plaintext as a rsa_engine.DecryptStream (after unlock)."""
+        self.expect(DONE)
+        return rsa_engine.DecryptStream(self.cipher, self.key, self.mode,
+                                        workers=workers if self.parallel else 1)
+
+
+class LocalGame:
+    """Missions played in this process (the single-player app)."""
+
+    def __init__(self, leaderboard, key_pool=None):
+        self.leaderboard = leaderboard
+        self.key_pool = key_pool
+
+    def new_mission(self, agent, level):
+        return Mission(agent, level, key_pool=self.key_pool,
+                       leaderboard=self.leaderboard, parallel=True)
+
+    def close(self):
+        if self.key_pool is not None:
+            self.key_pool.close()
@@ -0,0 +1,69 @@
+"""
+MISSION CLOCK
+Monotonic mission timer with per-stage split times.
+
+Time is always measured as the difference between two time.monotonic()
+readings, so a busy event loop can delay the on-screen tick but never the
+recorded time.
+"""
+import time
+
+
+class MissionClock:
+    def __init__(self, limit_s=120, clock=time.monotonic):
+        self.limit_s = limit_s
+        self.clock = clock
+        self.started = None
+        self.stopped = None
+        self.splits = {}
+        self.current_stage = None
+        self._stage_start = None
+
+    def start(self, first_stage=None):
+        self.started = self.clock()
+        self.stopped = None
+        self.splits = {}
+        self.current_stage = None
+        if first_stage:
+            self.enter(first_stage)
+
+    def enter(self, stage):
+        """Close the running stage's split (if any) and start timing `stage`."""
+        now = self.clock()
+        self._close_stage(now)
+        self.current_stage = stage
+        self._stage_start = now
+
+    def stop(self):
+        if self.started is not None and self.stopped is None:
+            self.stopped = self.clock()
+            self._close_stage(self.stopped)
+
+    def _close_stage(self, now):
+        if self.current_stage is not None:
+            taken = now - self._stage_start
+            self.splits[self.current_stage] = self.splits.get(self.current_stage, 0.0) + taken
+            self.current_stage = None
+
+    @property
+    def running(self):
+        return self.started is not None and self.stopped is None
+
+    def elapsed(self):
+        """Seconds since start, to the millisecond."""
+        if self.started is None:
+            return 0.0
+        end = self.stopped if self.stopped is not None else self.clock()
+        return round(end - self.started, 3)
+
+    def remaining(self):
+        return max(0.0, self.limit_s - self.elapsed())
+
+    def ms_to_next_second(self):
+        """Delay until the displayed countdown should change."""
+        frac = self.elapsed() % 1
+        return max(1, int((1 - frac) * 1000))
+
+    def split_times(self):
+        """{stage: seconds} rounded to the millisecond."""
+        return {stage: round(t, 3) for stage, t in self.splits.items()}
@@ -0,0 +1,193 @@
+"""
+EVENT-LOOP PROFILER
+Opt-in measurement of what the Tk event loop spends its time on.
+
+Once installed, every root.after callback, button command and animation
+frame is timed: how long it ran, and how late the loop delivered it
+compared to when it was due. F12 toggles a live overlay with the worst
+offenders; on exit everything is written to a JSON trace plus a CSV of
+the raw events.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+
+MAX_EVENTS = 100_000
+OVERLAY_ROWS = 8
+OVERLAY_REFRESH_MS = 500
+
+
+def callback_name(fn):
+    name = getattr(fn, "__qualname__", None) or repr(fn)
+    return name.replace(".<locals>", "")
+
+
+class Stat:
+    __slots__ = ("count", "total_ms", "max_ms", "late_total_ms", "late_max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = self.max_ms = 0.0
+        self.late_total_ms = self.late_max_ms = 0.0
+
+    def add(self, duration_ms, late_ms):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.late_total_ms += late_ms
+        self.late_max_ms = max(self.late_max_ms, late_ms)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "late_avg_ms": round(self.late_total_ms / self.count, 3) if self.count else 0.0,
+            "late_max_ms": round(self.late_max_ms, 3),
+        }
+
+
+class LoopProfiler:
+    def __init__(self, root, trace_path="rsa_vault_trace.json"):
+        self.root = root
+        self.trace_path = trace_path
+        self.started = time.perf_counter()
+        self.stats = {}
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.overlay = None
+        self._raw_after = None
+
+    # ============================
+    # RECORDING
+    # ============================
+    def record(self, label, kind, start, end, late_s=0.0):
+        duration_ms = (end - start) * 1000
+        late_ms = max(0.0, late_s * 1000)
+        stat = self.stats.get(label)
+        if stat is None:
+            stat = self.stats[label] = Stat()
+        stat.add(duration_ms, late_ms)
+        self.events.append((round((start - self.started) * 1000, 3), kind, label,
+                            round(duration_ms, 3), round(late_ms, 3)))
+
+    def wrap(self, fn, kind="command", due=None, label=None):
+        """fn wrapped so each call is timed (and checked against `due`, if given)."""
+        label = label or callback_name(fn)
+
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.record(label, kind, start, time.perf_counter(),
+                            start - due if due is not None else 0.0)
+        return timed
+
+    def install(self):
+        """Route root.after through the profiler and hook exit + F12."""
+        self._raw_after = raw_after = self.root.after
+
+        def after(ms, func=None, *args):
+            if func is None:
+                return raw_after(ms)
+            due = time.perf_counter() + ms / 1000
+            return raw_after(ms, self.wrap(func, "after", due), *args)
+
+        self.root.after = after
+        self.root.bind_all("<F12>", lambda e: self.toggle_overlay())
+        return self
+
+    # ============================
+    # OVERLAY
+    # ============================
+    def toggle_overlay(self):
+        import tkinter as tk
+
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+            return
+
+        self.overlay = tk.Label(
+            self.root, justify="left", anchor="nw",
+            fg="#00ff66", bg="#000000", font=("Courier New", 9)
+        )
+        self._refresh_overlay()
+
+    def _refresh_overlay(self):
+        if self.overlay is None or not self.overlay.winfo_exists():
+            self.overlay = None
+            return
+
+        rows = sorted(self.stats.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+        lines = [f"{'callback':<38}{'n':>6}{'avg ms':>8}{'max ms':>8}{'late ms':>9}"]
+        for label, s in rows[:OVERLAY_ROWS]:
+            d = s.as_dict()
+            lines.append(f"{label[-38:]:<38}{d['count']:>6}{d['avg_ms']:>8.2f}"
+                         f"{d['max_ms']:>8.2f}{d['late_avg_ms']:>9.2f}")
+        self.overlay.config(text="\n".join(lines))
+        self.overlay.place(relx=1.0, y=0, anchor="ne")
+        self.overlay.lift()
+        self._raw_after(OVERLAY_REFRESH_MS, self._refresh_overlay)
+
+    # ============================
+    # TRACE OUTPUT
+    # ============================
+    def summary(self):
+        return {label: s.as_dict() for label, s in
+                sorted(self.stats.items(), key=lambda kv: kv[1].total_ms, reverse=True)}
+
+    def dump(self, path=None):
+        """Write <path> (JSON summary + events) and <path stem>.csv (events)."""
+        path = path or self.trace_path
+        with open(path, "w") as f:
+            json.dump({
+                "duration_s": round(time.perf_counter() - self.started, 3),
+                "summary": self.summary(),
+                "events": [dict(zip(("t_ms", "kind", "label", "duration_ms", "late_ms"), e))
+                           for e in self.events],
+            }, f, indent=1)
+
+        csv_path = os.path.splitext(path)[0] + ".csv"
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["t_ms", "kind", "label", "duration_ms", "late_ms"])
+            writer.writerows(self.events)
+        return path, csv_path
+
+
+# ============================
+# STARTUP
+# ============================
+STARTUP_TARGET_MS = 150
+
+
+class StartupProfile:
+    """Checkpoints from the first line of main.py to an interactive window (--profile-startup)."""
+
+    def __init__(self, t0, target_ms=STARTUP_TARGET_MS):
+        self.t0 = t0
+        self.target_ms = target_ms
+        self.marks = []
+
+    def mark(self, name, at=None):
+        at = time.perf_counter() if at is None else at
+        self.marks.append((name, (at - self.t0) * 1000))
+
+    def report(self):
+        """The checkpoints so far, and whether the last one met the target."""
+        lines, last = ["Startup (ms since main.py began importing):"], 0.0
+        for name, t in self.marks:
+            lines.append(f"  {name:<24}{t - last:>8.1f}{t:>10.1f}")
+            last = t
+        verdict = "OK" if last <= self.target_ms else "OVER TARGET"
+        lines.append(f"  interactive after {last:.1f} ms (target {self.target_ms} ms): {verdict}")
+        return "\n".join(lines)
+
+    def note(self, name):
+        """Mark work done after the window is up, as one line."""
+        self.mark(name)
+        return f"  {name:<24}{'':>8}{self.marks[-1][1]:>10.1f}"
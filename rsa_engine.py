@@ -0,0 +1,903 @@
+"""
+RSA ENGINE
+Headless RSA math used by the RSA Vault game.
+
+Nothing in here touches tkinter or winsound, so scripts and tests can
+generate keys and encrypt/decrypt in bulk without opening a window.
+"""
+import atexit
+import codecs
+import itertools
+import math
+import os
+import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+# ============================
+# KEY OBJECT
+# ============================
+@dataclass(frozen=True)
+class RSAKey:
+    p: int
+    q: int
+    n: int
+    phi: int
+    e: int
+    d: int
+
+    # CRT parameters, derived from p, q and d
+    dP: int = field(init=False, repr=False)
+    dQ: int = field(init=False, repr=False)
+    qInv: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # d mod (p - 1) can be 0 (e.g. p = 2); p - 1 is the same exponent
+        # by Fermat and still maps c = 0 to 0.
+        object.__setattr__(self, "dP", self.d % (self.p - 1) or self.p - 1)
+        object.__setattr__(self, "dQ", self.d % (self.q - 1) or self.q - 1)
+        object.__setattr__(self, "qInv", pow(self.q, -1, self.p))
+
+
+def key_to_dict(key):
+    """JSON-friendly form of a key (the rest is re-derived on load)."""
+    return {"p": key.p, "q": key.q, "e": key.e}
+
+
+def key_from_dict(data):
+    p, q, e = int(data["p"]), int(data["q"]), int(data["e"])
+    n, phi = compute_modulus(p, q)
+    return RSAKey(p, q, n, phi, e, private_exponent(e, phi))
+
+
+# ============================
+# MISSION RULES
+# ============================
+# The checks the prime stage applies to typed primes, shared by the GUI and
+# headless players so both reject exactly the same input.
+def prime_level_error(value, level, prime_range):
+    """Why `value` is not allowed as a prime at `level`, or None."""
+    digits = len(str(abs(value)))
+
+    if level == "EASY":
+        if digits > 2:
+            return "EASY mode: primes must be at most 2 digits (1–50)."
+        if not (1 <= value <= 50):
+            return "EASY mode: primes must be between 1 and 50."
+
+    elif level == "MEDIUM":
+        if digits > 3:
+            return "MEDIUM mode: primes must be at most 3 digits."
+        if not (50 <= value <= 150):
+            return "MEDIUM mode: primes must be between 50 and 150."
+
+    elif level == "HARD":
+        if digits > 3:
+            return "HARD mode: primes must be at most 3 digits."
+        if not (150 <= value <= 300):
+            return "HARD mode: primes must be between 150 and 300."
+
+    elif level in KEY_SIZE_TIERS:
+        half = KEY_SIZE_TIERS[level] // 2
+        lo, hi = prime_range
+        if not (lo <= value < hi):
+            return f"{level} mode: primes must be {half}-bit numbers with the top two bits set."
+
+    return None
+
+
+def prime_pair_error(p, q, level, prime_range):
+    """(title, message) the prime stage rejects p and q with, or None if they pass."""
+    if p < 0 or q < 0:
+        return "INPUT ERROR", "Prime numbers cannot be negative."
+    if p == q:
+        return "INPUT ERROR", "p and q must be different primes."
+    for value in (p, q):
+        message = prime_level_error(value, level, prime_range)
+        if message:
+            return "INPUT ERROR", message
+    if not (is_prime(p) and is_prime(q)):
+        return "ERROR", "One or both numbers are not prime."
+    return None
+
+
+# ============================
+# DIFFICULTY TIERS
+# ============================
+# Classic teaching levels: primes are picked from a small (lo, hi) range.
+DIFFICULTY_RANGES = {
+    "EASY": (1, 50),
+    "MEDIUM": (50, 150),
+    "HARD": (150, 300),
+}
+
+# Advanced levels: real key sizes, primes are half the modulus bit length.
+KEY_SIZE_TIERS = {
+    "RSA-512": 512,
+    "RSA-1024": 1024,
+    "RSA-2048": 2048,
+}
+
+
+def prime_range_for_bits(key_bits):
+    """
+    (lo, hi) range for each prime of a key_bits modulus.
+    The two top bits are forced on so p * q always has exactly key_bits bits.
+    """
+    half = key_bits // 2
+    return 3 << (half - 2), 1 << half
+
+
+def level_ranges():
+    """Every selectable level mapped to its prime range, classic levels first."""
+    levels = dict(DIFFICULTY_RANGES)
+    for name, bits in KEY_SIZE_TIERS.items():
+        levels[name] = prime_range_for_bits(bits)
+    return levels
+
+
+# ============================
+# PRIMES
+# ============================
+SMALL_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53,
+                59, 61, 67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109, 113,
+                127, 131, 137, 139, 149, 151, 157, 163, 167, 173, 179, 181,
+                191, 193, 197, 199, 211, 223, 227, 229, 233, 239, 241, 251]
+
+# The first 13 prime bases make Miller-Rabin exact for every n below
+# psi_13 = 3.3 * 10^24 (the first 12 only reach psi_12 = 3.2 * 10^23).
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+# Extra random bases beyond the deterministic limit (error < 4^-40).
+MR_EXTRA_ROUNDS = 40
+
+# Rounds used on freshly generated random candidates. Random (non-adversarial)
+# inputs fail far more often than 1/4 per round, so a handful is plenty:
+# FIPS 186-4 table C.2 asks for 5 rounds at 512-bit, 4 at 1024-bit.
+MR_GEN_ROUNDS = 8
+
+# Ranges with hi up to this bound use a bitset sieve; beyond it primes are
+# sampled at random and checked with Miller-Rabin.
+SIEVE_MAX = 50_000_000
+
+# Narrow sieved ranges are listed and sampled; wider ones are scanned.
+ENUMERATE_LIMIT = 1 << 16
+
+# Prime generation sieves a window of odd candidates by every prime below
+# SIEVE_BOUND before running a single Miller-Rabin round.
+SIEVE_BOUND = 1 << 14
+SIEVE_WINDOW = 4096
+_sieve_primes = []
+
+# Shared sieves, built on first use (see prime_sieve / custom_sieve).
+_classic_sieve = None
+_custom_sieve = None
+_prime_index = {}
+
+
+def _miller_rabin(n, bases):
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n, rng=random, rounds=MR_EXTRA_ROUNDS):
+    """
+    Miller-Rabin primality test.
+    Deterministic below DETERMINISTIC_LIMIT, probabilistic beyond it
+    (`rounds` extra random bases).
+    """
+    if n < 2:
+        return False
+    if n < CLASSIC_SIEVE_LIMIT:
+        return n in prime_sieve()
+    for sp in SMALL_PRIMES:
+        if n % sp == 0:
+            return n == sp
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+
+    if n < DETERMINISTIC_LIMIT:
+        return _miller_rabin(n, DETERMINISTIC_BASES)
+    if not _miller_rabin(n, (2,)):
+        return False
+    extra = [rng.randrange(3, n - 1) for _ in range(rounds)]
+    return _miller_rabin(n, extra)
+
+
+def _odd_primes_below(limit):
+    global _sieve_primes
+    if not _sieve_primes:
+        _sieve_primes = PrimeSieve(limit).primes(3, limit)
+    return _sieve_primes
+
+
+def random_prime_in_range(lo, hi, rng=random):
+    """
+    Random prime with lo <= p < hi (for ranges too wide to list).
+    Picks a random odd start, sieves the next SIEVE_WINDOW odd numbers by the
+    small primes and only runs Miller-Rabin on the survivors.
+    """
+    small = _odd_primes_below(SIEVE_BOUND)
+    while True:
+        start = rng.randrange(lo, hi) | 1
+        width = min(SIEVE_WINDOW, (hi - start + 1) // 2)
+        if width <= 0:
+            continue
+
+        # alive[i] stands for the candidate start + 2 * i
+        alive = bytearray([1]) * width
+        for sp in small:
+            if sp * sp > start + 2 * width:
+                break
+            first = (-start * pow(2, -1, sp)) % sp
+            if start + 2 * first == sp:
+                first += sp
+            if first < width:
+                alive[first::sp] = bytes(len(range(first, width, sp)))
+
+        for i in range(width):
+            if alive[i]:
+                candidate = start + 2 * i
+                if is_prime(candidate, rng, MR_GEN_ROUNDS):
+                    return candidate
+
+
+def random_prime(bits, rng=random):
+    """Random prime of exactly `bits` bits with the top two bits set."""
+    if bits < 3:
+        raise ValueError("Primes need at least 3 bits.")
+    return random_prime_in_range(3 << (bits - 2), 1 << bits, rng)
+
+
+def primes_in_range(lo, hi):
+    """All primes p with lo <= p < hi."""
+    if hi <= CLASSIC_SIEVE_LIMIT:
+        return prime_sieve().primes(lo, hi)
+    if hi <= SIEVE_MAX:
+        return custom_sieve(hi).primes(lo, hi)
+    return [n for n in range(lo, hi) if is_prime(n)]
+
+
+def random_prime_pair(prime_range, rng=random, level=None):
+    """
+    Pick two different primes from prime_range = (lo, hi).
+    Passing a classic `level` samples straight from its precomputed index.
+    """
+    lo, hi = prime_range
+    if level in DIFFICULTY_RANGES:
+        primes = prime_index(level)
+    elif hi > SIEVE_MAX or (hi - lo > ENUMERATE_LIMIT):
+        pick = (custom_sieve(hi).random_prime if hi <= SIEVE_MAX
+                else random_prime_in_range)
+        p = pick(lo, hi, rng)
+        q = pick(lo, hi, rng)
+        while q == p:
+            q = pick(lo, hi, rng)
+        return p, q
+    else:
+        primes = primes_in_range(lo, hi)
+
+    if len(primes) < 2:
+        raise ValueError(f"Not enough primes in range {prime_range}.")
+    p, q = rng.sample(primes, 2)
+    return p, q
+
+
+# ============================
+# SIEVE
+# ============================
+class PrimeSieve:
+    """
+    Sieve of Eratosthenes over [0, limit) stored as a bitset of odd numbers:
+    bit i says whether 2*i + 1 is prime, so 10^7 numbers fit in ~610 KB.
+    Built segment by segment, so peak memory stays near one SEGMENT.
+    """
+    SEGMENT = 1 << 18   # odd numbers per pass, multiple of 8
+    _TO_BITCHAR = bytes.maketrans(b"\x00\x01", b"01")
+
+    def __init__(self, limit):
+        self.limit = limit
+        size = limit // 2
+        base = self._base_primes(math.isqrt(limit) + 1)
+        self.bits = bytearray()
+
+        for seg_start in range(0, size, self.SEGMENT):
+            seg_end = min(seg_start + self.SEGMENT, size)
+            seg = bytearray([1]) * (seg_end - seg_start)
+            if seg_start == 0:
+                seg[0] = 0   # 1 is not prime
+
+            for p in base:
+                first = (p * p) // 2
+                if first >= seg_end:
+                    break
+                if first < seg_start:
+                    first = seg_start + (first - seg_start) % p
+                seg[first - seg_start::p] = bytes(len(range(first, seg_end, p)))
+
+            # bytes of 0/1 -> packed little-endian bits
+            bit_string = seg.translate(self._TO_BITCHAR)[::-1]
+            self.bits += int(bit_string, 2).to_bytes((len(seg) + 7) // 8, "little")
+
+    @staticmethod
+    def _base_primes(limit):
+        flags = bytearray([1]) * limit
+        flags[0:2] = b"\x00\x00"[:limit]
+        for i in range(2, math.isqrt(limit) + 1):
+            if flags[i]:
+                flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+        return [i for i in range(3, limit) if flags[i]]
+
+    def __contains__(self, n):
+        if not 0 <= n < self.limit:
+            raise ValueError(f"{n} is outside this sieve (limit {self.limit}).")
+        if n % 2 == 0:
+            return n == 2
+        i = n >> 1
+        return bool(self.bits[i >> 3] >> (i & 7) & 1)
+
+    def primes(self, lo, hi):
+        """Sorted list of primes p with lo <= p < hi."""
+        hi = min(hi, self.limit)
+        found = [2] if lo <= 2 < hi else []
+        bits = self.bits
+        # bit i exists for i < limit // 2 (odd numbers below limit)
+        for i in range(max(lo, 1) // 2, min((hi + 1) // 2, self.limit // 2)):
+            if bits[i >> 3] >> (i & 7) & 1:
+                n = 2 * i + 1
+                if lo <= n < hi:
+                    found.append(n)
+        return found
+
+    def random_prime(self, lo, hi, rng=random):
+        """A prime in [lo, hi): scan forward from a random point, wrapping once."""
+        hi = min(hi, self.limit)
+        start = rng.randrange(lo, hi)
+        for n in itertools.chain(range(start, hi), range(lo, start)):
+            if n in self:
+                return n
+        raise ValueError(f"No prime in range ({lo}, {hi}).")
+
+
+CLASSIC_SIEVE_LIMIT = max(hi for _, hi in DIFFICULTY_RANGES.values()) + 1
+
+
+def prime_sieve():
+    """The shared sieve covering every classic difficulty range (built once)."""
+    global _classic_sieve
+    if _classic_sieve is None:
+        _classic_sieve = PrimeSieve(CLASSIC_SIEVE_LIMIT)
+    return _classic_sieve
+
+
+def custom_sieve(hi):
+    """A sieve covering [0, hi), reused until a larger one is asked for."""
+    global _custom_sieve
+    if hi > SIEVE_MAX:
+        raise ValueError(f"Sieve ranges are capped at {SIEVE_MAX}.")
+    if _custom_sieve is None or _custom_sieve.limit < hi:
+        _custom_sieve = PrimeSieve(hi)
+    return _custom_sieve
+
+
+def prime_index(level):
+    """Sorted tuple of the primes in a classic level's range."""
+    if level not in _prime_index:
+        lo, hi = DIFFICULTY_RANGES[level]
+        _prime_index[level] = tuple(prime_sieve().primes(lo, hi))
+    return _prime_index[level]
+
+
+def keygen_bits(key_bits, e=None, rng=random):
+    """Fresh RSAKey with a key_bits modulus."""
+    return keygen(e=e, prime_range=prime_range_for_bits(key_bits), rng=rng)
+
+
+# ============================
+# KEY GENERATION
+# ============================
+def compute_modulus(p, q):
+    """Return (n, phi) for the primes p and q."""
+    return p * q, (p - 1) * (q - 1)
+
+
+# The standard public exponent (Fermat prime F4), offered first whenever valid.
+F4 = 65537
+
+# Random exponents are drawn below 2^RANDOM_E_BITS: as unpredictable as the
+# game needs while keeping encryption cheap. Below RANDOM_E_MIN_PHI the
+# valid exponents are too few to sample, so the ascending scan is used.
+RANDOM_E_BITS = 32
+RANDOM_E_MIN_PHI = 1 << 20
+
+
+def iter_public_exponents(phi, rng=None):
+    """
+    Lazily yield valid public exponents e (3 <= e < phi, gcd(e, phi) == 1),
+    without repeats: F4 first when valid, then ascending from 3, or random
+    draws from rng when given and phi is large enough.
+    """
+    if F4 < phi and math.gcd(F4, phi) == 1:
+        yield F4
+
+    if rng is None or phi < RANDOM_E_MIN_PHI:
+        # Never build range(3, phi) as a list: phi can be a 2048-bit number.
+        for e in range(3, phi):
+            if e != F4 and math.gcd(e, phi) == 1:
+                yield e
+        return
+
+    hi = min(phi, 1 << RANDOM_E_BITS)
+    seen = {F4}
+    while True:
+        e = rng.randrange(3, hi) | 1
+        if e < phi and e not in seen and math.gcd(e, phi) == 1:
+            seen.add(e)
+            yield e
+
+
+def public_exponents(phi, count=5, rng=None):
+    """Up to `count` valid public exponents (see iter_public_exponents)."""
+    return list(itertools.islice(iter_public_exponents(phi, rng), count))
+
+
+def random_public_exponent(phi, rng=random, tries=64):
+    """One random valid e for phi (the first valid one if draws keep missing), or None."""
+    hi = min(phi, 1 << RANDOM_E_BITS)
+    for _ in range(tries if hi > 3 else 0):
+        e = rng.randrange(3, hi) | 1
+        if e < phi and math.gcd(e, phi) == 1:
+            return e
+    return next(iter_public_exponents(phi), None)
+
+
+def private_exponent(e, phi):
+    """d such that e * d = 1 (mod phi)."""
+    return pow(e, -1, phi)
+
+
+def keygen(p=None, q=None, e=None, prime_range=(10, 50), rng=random):
+    """
+    Build a full RSAKey.
+    Missing primes are drawn from prime_range, a missing e is the first
+    exponent iter_public_exponents offers (F4 when valid).
+    """
+    if p is None or q is None:
+        p, q = random_prime_pair(prime_range, rng)
+    elif p == q:
+        raise ValueError("p and q must be different primes.")
+    elif not (is_prime(p) and is_prime(q)):
+        raise ValueError("One or both numbers are not prime.")
+
+    n, phi = compute_modulus(p, q)
+    if e is None:
+        options = public_exponents(phi, 1)
+        if not options:
+            raise ValueError(f"No valid public exponent for phi = {phi}.")
+        e = options[0]
+    elif math.gcd(e, phi) != 1:
+        raise ValueError(f"e = {e} is not coprime with phi = {phi}.")
+
+    return RSAKey(p, q, n, phi, e, private_exponent(e, phi))
+
+
+# ============================
+# CODEBOOK CACHE
+# ============================
+class CodebookCache:
+    """
+    LRU cache of per-key codebooks for CHAR mode.
+
+    A codebook maps m -> m^exponent mod n for one (exponent, n) pair, so
+    (e, n) books hold code point -> ciphertext and (d, n) books hold
+    ciphertext -> code point. A message only has a few dozen distinct
+    characters, so each one is exponentiated once however long the message is.
+
+    hits / misses count distinct symbols looked up per call.
+    """
+
+    def __init__(self, max_books=16, max_entries=4096):
+        self.max_books = max_books
+        self.max_entries = max_entries
+        self._books = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _book(self, exponent, n):
+        key = (exponent, n)
+        book = self._books.get(key)
+        if book is None:
+            book = self._books[key] = OrderedDict()
+            if len(self._books) > self.max_books:
+                _, dropped = self._books.popitem(last=False)
+                self.evictions += len(dropped)
+        else:
+            self._books.move_to_end(key)
+        return book
+
+    def apply(self, values, exponent, n, power_many):
+        """
+        Map every v in values to v^exponent mod n.
+        power_many(list) -> list is called once, on the distinct values
+        that are not in the codebook yet.
+        """
+        book = self._book(exponent, n)
+        table = {}
+        missing = []
+        for v in set(values):
+            result = book.get(v)
+            if result is None:
+                missing.append(v)
+            else:
+                self.hits += 1
+                book.move_to_end(v)
+                table[v] = result
+
+        if missing:
+            self.misses += len(missing)
+            for v, result in zip(missing, power_many(missing)):
+                table[v] = book[v] = result
+                if len(book) > self.max_entries:
+                    book.popitem(last=False)
+                    self.evictions += 1
+        return [table[v] for v in values]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "books": len(self._books),
+            "entries": sum(len(b) for b in self._books.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self._books.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+# Shared cache used by encrypt / decrypt in CHAR mode.
+CODEBOOKS = CodebookCache()
+
+
+# ============================
+# ENCRYPT / DECRYPT
+# ============================
+# CHAR:  one ciphertext per character, c = ord(ch)^e mod n (teaching default).
+# BLOCK: the UTF-8 bytes are packed into integers just below n, so one
+#        exponentiation covers block_payload_size(n) bytes.
+MODE_CHAR = "CHAR"
+MODE_BLOCK = "BLOCK"
+MODES = (MODE_CHAR, MODE_BLOCK)
+
+
+def block_payload_size(n):
+    """
+    Message bytes per block for modulus n.
+    Each block is 0x01 + payload, so leading zero bytes survive the round
+    trip; the whole block has to stay below n.
+    """
+    return (n.bit_length() - 1) // 8 - 1
+
+
+def supports_block_mode(n):
+    return block_payload_size(n) >= 1
+
+
+def pack_bytes(data, n):
+    """Split raw bytes into integers smaller than n."""
+    size = block_payload_size(n)
+    if size < 1:
+        raise ValueError(f"n = {n} is too small for BLOCK mode (needs n >= 65536).")
+    return [int.from_bytes(b"\x01" + data[i:i + size], "big")
+            for i in range(0, len(data), size)]
+
+
+def unpack_bytes(blocks):
+    """Inverse of pack_bytes."""
+    return b"".join(m.to_bytes((m.bit_length() + 7) // 8, "big")[1:] for m in blocks)
+
+
+def pack_blocks(msg, n):
+    """UTF-8 encode msg and split it into integers smaller than n."""
+    return pack_bytes(msg.encode("utf-8"), n)
+
+
+def unpack_blocks(blocks):
+    """Inverse of pack_blocks."""
+    return unpack_bytes(blocks).decode("utf-8")
+
+
+def _to_ints(msg, n, mode):
+    if mode == MODE_BLOCK:
+        return pack_blocks(msg, n)
+    return [ord(c) for c in msg]
+
+
+def _from_ints(values, mode):
+    if mode == MODE_BLOCK:
+        return unpack_blocks(values)
+    return "".join([chr(m) for m in values])
+
+
+def encrypt(msg, e, n, mode=MODE_CHAR, cache=True):
+    """
+    Encrypt msg in the given mode: every integer m becomes m^e mod n.
+    CHAR mode goes through the CODEBOOKS cache unless cache=False.
+    """
+    values = _to_ints(msg, n, mode)
+    if cache and mode == MODE_CHAR:
+        return CODEBOOKS.apply(values, e, n, lambda vs: [pow(m, e, n) for m in vs])
+    return [pow(m, e, n) for m in values]
+
+
+def decrypt(cipher, d, n, mode=MODE_CHAR, cache=True):
+    """Inverse of encrypt: every c becomes c^d mod n."""
+    if cache and mode == MODE_CHAR:
+        return _from_ints(CODEBOOKS.apply(cipher, d, n, lambda vs: [pow(c, d, n) for c in vs]), mode)
+    return _from_ints([pow(c, d, n) for c in cipher], mode)
+
+
+def decrypt_int_crt(c, key):
+    """
+    c^d mod n via the Chinese Remainder Theorem (Garner's formula).
+    Two half-size exponentiations instead of one full-size one.
+    """
+    m1 = pow(c, key.dP, key.p)
+    m2 = pow(c, key.dQ, key.q)
+    h = key.qInv * (m1 - m2) % key.p
+    return m2 + h * key.q
+
+
+def decrypt_crt(cipher, key, mode=MODE_CHAR, cache=True):
+    """Same result as decrypt(cipher, key.d, key.n, mode), using the CRT parameters."""
+    if cache and mode == MODE_CHAR:
+        values = CODEBOOKS.apply(cipher, key.d, key.n, lambda vs: [decrypt_int_crt(c, key) for c in vs])
+        return _from_ints(values, mode)
+    return _from_ints([decrypt_int_crt(c, key) for c in cipher], mode)
+
+
+def encrypt_many(messages, key, mode=MODE_CHAR, cache=True):
+    """Encrypt every message in `messages` with the public half of key."""
+    e, n = key.e, key.n
+    return [encrypt(msg, e, n, mode, cache) for msg in messages]
+
+
+def decrypt_many(ciphers, key, crt=True, mode=MODE_CHAR, cache=True):
+    """
+    Decrypt every ciphertext in `ciphers` with the private half of key.
+    crt=False uses the plain c^d mod n path.
+    """
+    if crt:
+        return [decrypt_crt(cipher, key, mode, cache) for cipher in ciphers]
+    d, n = key.d, key.n
+    return [decrypt(cipher, d, n, mode, cache) for cipher in ciphers]
+
+
+def codebook_stats():
+    """Hit/miss counters of the shared CHAR-mode codebook cache."""
+    return CODEBOOKS.stats()
+
+
+# ============================
+# MULTI-CORE PATH
+# ============================
+# Below this many modular exponentiations the work stays in-process:
+# starting and feeding worker processes costs more than it saves.
+PARALLEL_THRESHOLD = 256
+
+# Each worker gets a few chunks so an uneven chunk does not stall the rest.
+CHUNKS_PER_WORKER = 4
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()   # file jobs and the Tk thread both ask for the pool
+
+
+def pow_chunk(args):
+    """Worker job: (values, exponent, n) -> [v^exponent mod n]."""
+    values, exponent, n = args
+    return [pow(v, exponent, n) for v in values]
+
+
+def crt_chunk(args):
+    """Worker job: (ciphertexts, key) -> CRT-decrypted integers."""
+    values, key = args
+    return [decrypt_int_crt(c, key) for c in values]
+
+
+def get_executor(workers=None):
+    """The shared ProcessPoolExecutor, created on first use."""
+    global _executor, _executor_workers
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            _shutdown_executor_locked()
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_executor():
+    with _executor_lock:
+        _shutdown_executor_locked()
+
+
+def _shutdown_executor_locked():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+atexit.register(shutdown_executor)
+
+
+def _chunked(values, workers):
+    size = max(1, -(-len(values) // (workers * CHUNKS_PER_WORKER)))
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def parallel_map(chunk_fn, values, extra, workers=None):
+    """
+    chunk_fn((chunk, *extra)) over values split into chunks.
+    Output order matches input order; small inputs run in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(values) < PARALLEL_THRESHOLD:
+        return chunk_fn((values, *extra))
+
+    jobs = [(chunk, *extra) for chunk in _chunked(values, workers)]
+    results = []
+    for part in get_executor(workers).map(chunk_fn, jobs):
+        results.extend(part)
+    return results
+
+
+def encrypt_parallel(msg, e, n, mode=MODE_CHAR, workers=None, cache=True):
+    """encrypt() with the exponentiations spread over worker processes."""
+    values = _to_ints(msg, n, mode)
+    power_many = lambda vs: parallel_map(pow_chunk, vs, (e, n), workers)
+    if cache and mode == MODE_CHAR:
+        return CODEBOOKS.apply(values, e, n, power_many)
+    return power_many(values)
+
+
+def decrypt_parallel(cipher, key, mode=MODE_CHAR, crt=True, workers=None, cache=True):
+    """decrypt() / decrypt_crt() with the exponentiations spread over worker processes."""
+    if crt:
+        power_many = lambda vs: parallel_map(crt_chunk, vs, (key,), workers)
+    else:
+        power_many = lambda vs: parallel_map(pow_chunk, vs, (key.d, key.n), workers)
+
+    if cache and mode == MODE_CHAR:
+        return _from_ints(CODEBOOKS.apply(cipher, key.d, key.n, power_many), mode)
+    return _from_ints(power_many(list(cipher)), mode)
+
+
+# ============================
+# STREAMING DECRYPTION
+# ============================
+# Characters of plaintext per chunk: small enough that one chunk decrypted
+# in-process fits in an animation frame, large enough to batch the work.
+STREAM_CHUNK_CHARS = 512
+# BLOCK ciphertexts with at least this many blocks are decrypted by the
+# worker pool, a few blocks per job so the first text arrives quickly.
+STREAM_PARALLEL_BLOCKS = 16
+STREAM_BLOCKS_PER_JOB = 4
+
+
+def decrypt_chunk(values, key, mode=MODE_CHAR, cache=True):
+    """CRT-decrypted integers for one chunk (worker-safe: CHAR mode uses this process's codebooks)."""
+    if cache and mode == MODE_CHAR:
+        return CODEBOOKS.apply(values, key.d, key.n, lambda vs: [decrypt_int_crt(c, key) for c in vs])
+    return [decrypt_int_crt(c, key) for c in values]
+
+
+class DecryptStream:
+    """
+    Decrypt a ciphertext chunk by chunk, in order, as text.
+    read() returns the next chunk's text ("" once finished). In the pool
+    path every chunk is submitted up front and ready() tells whether the
+    next one can be read without waiting, so a UI can poll it per frame.
+    """
+
+    def __init__(self, cipher, key, mode=MODE_CHAR, workers=None, cache=True):
+        self.key = key
+        self.mode = mode
+        self.cache = cache
+        cipher = list(cipher)
+
+        if mode == MODE_BLOCK:
+            per_chunk = max(1, STREAM_CHUNK_CHARS // max(1, block_payload_size(key.n)))
+            self.decoder = codecs.getincrementaldecoder("utf-8")()
+        else:
+            per_chunk = STREAM_CHUNK_CHARS
+            self.decoder = None
+
+        workers = workers or os.cpu_count() or 1
+        use_pool = mode == MODE_BLOCK and workers > 1 and len(cipher) >= STREAM_PARALLEL_BLOCKS
+        if use_pool:
+            per_chunk = min(per_chunk, STREAM_BLOCKS_PER_JOB)
+
+        self.chunks = [cipher[i:i + per_chunk] for i in range(0, len(cipher), per_chunk)]
+        self.futures = None
+        if use_pool:
+            pool = get_executor(workers)
+            self.futures = [pool.submit(crt_chunk, (chunk, key)) for chunk in self.chunks]
+        self.position = 0
+
+    @property
+    def done(self):
+        return self.position >= len(self.chunks)
+
+    def ready(self):
+        """True if read() will not block on a worker."""
+        return self.done or self.futures is None or self.futures[self.position].done()
+
+    def read(self):
+        if self.done:
+            return ""
+        i = self.position
+        if self.futures is not None:
+            values = self.futures[i].result()
+            self.futures[i] = None
+            self.chunks[i] = None
+            self.position += 1
+            return self.decode(values, self.done)
+
+        chunk, last = self.take()
+        return self.decode(decrypt_chunk(chunk, self.key, self.mode, self.cache), last)
+
+    def take(self):
+        """
+        The next chunk's ciphertext and whether it is the last one, for a
+        caller that decrypts it elsewhere (see decrypt_chunk) and passes
+        the integers back to decode(). Not for the pool path.
+        """
+        chunk = self.chunks[self.position]
+        self.chunks[self.position] = None
+        self.position += 1
+        return chunk, self.done
+
+    def decode(self, values, last):
+        """Decrypted integers of one chunk -> text, in read order."""
+        if self.decoder is not None:
+            # a character's UTF-8 bytes may straddle two blocks
+            return self.decoder.decode(unpack_bytes(values), final=last)
+        return _from_ints(values, self.mode)
+
+    def close(self):
+        """Drop whatever has not been read yet (queued pool jobs are cancelled)."""
+        if self.futures is not None:
+            for future in self.futures[self.position:]:
+                if future is not None:
+                    future.cancel()
+        self.position = len(self.chunks)
+
+    def __iter__(self):
+        while not self.done:
+            yield self.read()
+
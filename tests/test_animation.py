@@ -0,0 +1,43 @@
+from animation import AnimationScheduler
+
+
+class FakeRoot:
+    """Just enough of Tk for the scheduler: after() queues, nothing runs."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.reported = []
+
+    def after(self, ms, fn):
+        self.scheduled.append(fn)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.reported.append(exc)
+
+
+def test_failing_animation_does_not_stop_the_clock():
+    root = FakeRoot()
+    scheduler = AnimationScheduler(root)
+    ticks = []
+
+    def broken():
+        raise RuntimeError("boom")
+
+    bad = scheduler.add(broken, 0)
+    good = scheduler.add(lambda: ticks.append(1), 0)
+
+    root.scheduled.pop()()
+    assert not bad.active and good.active
+    assert [type(e) for e in root.reported] == [RuntimeError]
+    assert ticks == [1]
+    assert root.scheduled, "frame clock was not rescheduled"
+
+    root.scheduled.pop()()
+    assert ticks == [1, 1]
@@ -0,0 +1,23 @@
+import json
+
+import rsa_engine
+from key_pool import KeyPool
+
+
+def test_load_skips_composite_primes(tmp_path):
+    path = tmp_path / "key_pool.json"
+    path.write_text(json.dumps({"EASY": [{"level": "EASY", "p": 9, "q": 15, "random_e": None},
+                                         {"level": "EASY", "p": 11, "q": 13, "random_e": None}]}))
+    pool = KeyPool(rsa_engine.level_ranges())
+    assert pool.load(str(path)) == 1
+    assert pool.take("EASY").matches(11, 13)
+    pool.close()
+
+
+def test_start_loads_in_the_background(tmp_path):
+    path = tmp_path / "key_pool.json"
+    path.write_text(json.dumps({"EASY": [{"level": "EASY", "p": 11, "q": 13, "random_e": None}]}))
+    pool = KeyPool({"EASY": rsa_engine.level_ranges()["EASY"]}, size=1, path=str(path)).start()
+    pool._loader.join()
+    assert pool.take("EASY").matches(11, 13)
+    pool.close()
@@ -0,0 +1,70 @@
+import random
+
+from leaderboard import ALL_LEVELS, LeaderboardStore
+
+LEVELS = ["EASY", "MEDIUM", "HARD"]
+TOP_K = 3
+
+
+def full_sort(history, level=None):
+    """Top-K the slow way: sort every run by (time, id)."""
+    runs = sorted((t, run_id, agent, lvl) for run_id, agent, t, lvl in history
+                  if level is None or lvl == level)
+    return [(agent, t, lvl) for t, _, agent, lvl in runs[:TOP_K]]
+
+
+def assert_matches_full_sort(store, history):
+    assert store.top(difficulty=ALL_LEVELS) == full_sort(history)
+    assert store.top() == full_sort(history)
+    assert sorted(store.levels()) == sorted({lvl for _, _, _, lvl in history})
+    for level in LEVELS:
+        assert store.top(difficulty=level) == full_sort(history, level)
+
+
+def random_runs(rng, count):
+    # coarse times so ties (broken by run id) come up often
+    return [(f"agent{rng.randrange(50)}", float(rng.randrange(20)), rng.choice(LEVELS))
+            for _ in range(count)]
+
+
+def test_top_matches_full_sort_across_add_and_add_many(tmp_path):
+    rng = random.Random(7)
+    store = LeaderboardStore(str(tmp_path / "lb.db"), top_k=TOP_K)
+    history = []
+    try:
+        for run in random_runs(rng, 40):
+            history.append((store.add(*run), *run))
+            assert_matches_full_sort(store, history)
+
+        for _ in range(5):
+            batch = random_runs(rng, 15)
+            ids = store.add_many(batch)
+            history.extend((run_id, *run) for run_id, run in zip(ids, batch))
+            assert_matches_full_sort(store, history)
+
+        store.rebuild_top()
+        assert_matches_full_sort(store, history)
+    finally:
+        store.close()
+
+
+def test_migrated_history_feeds_top_k(tmp_path):
+    rng = random.Random(11)
+    legacy = tmp_path / "leaderboard.txt"
+    legacy_runs = random_runs(rng, 30)
+    legacy.write_text("".join(f"{a},{t},{lvl}\n" for a, t, lvl in legacy_runs)
+                      + "not a run\nagent,slow,EASY\n")
+
+    store = LeaderboardStore(str(tmp_path / "lb.db"), legacy_path=str(legacy), top_k=TOP_K)
+    try:
+        # migrated rows get ids 1..N in file order
+        history = [(i, *run) for i, run in enumerate(legacy_runs, 1)]
+        assert store.count() == len(history)
+        assert_matches_full_sort(store, history)
+
+        assert store.migrate_text(str(legacy)) == 0
+        for run in random_runs(rng, 20):
+            history.append((store.add(*run), *run))
+        assert_matches_full_sort(store, history)
+    finally:
+        store.close()
@@ -0,0 +1,76 @@
+import asyncio
+import socket
+import sqlite3
+
+import pytest
+
+import leaderboard_service
+from leaderboard import LeaderboardStore
+from leaderboard_service import LeaderboardClient, LeaderboardService
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_add_falls_back_when_service_is_down(tmp_path):
+    client = LeaderboardClient(str(tmp_path / "lb.db"), port=free_port())
+    client.add("Bond", 12.5, "EASY")
+    assert client.direct().count() == 1
+
+
+def test_add_does_not_write_directly_after_sending(tmp_path):
+    # a service that accepts the run but never answers
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        client = LeaderboardClient(str(tmp_path / "lb.db"), port=server.getsockname()[1], timeout=0.2)
+        with pytest.raises(OSError):
+            client.add("Bond", 12.5, "EASY")
+    assert client.direct().count() == 0
+
+
+class FlakyStore(LeaderboardStore):
+    """Fails the next `failures` batch writes like a locked database."""
+
+    failures = 0
+
+    def add_many(self, runs):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().add_many(runs)
+
+
+def test_failed_flush_keeps_the_batch_and_the_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(leaderboard_service, "FLUSH_INTERVAL", 0.01)
+    store = FlakyStore(str(tmp_path / "lb.db"))
+    store.failures = 2
+
+    async def scenario():
+        service = LeaderboardService(store)
+        loop = asyncio.create_task(service.flush_loop())
+        service.add("Bond", 12.5, "EASY")
+        service.add("Moneypenny", 9.0, "EASY")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if not service.pending:
+                break
+        assert not loop.done()
+        loop.cancel()
+        return service
+
+    service = asyncio.run(scenario())
+    assert service.pending == []
+    assert store.count() == 2
+    store.close()
+
+
+def test_database_errors_surface_as_oserror(tmp_path):
+    client = LeaderboardClient(str(tmp_path / "missing" / "lb.db"), port=free_port())
+    with pytest.raises(OSError):
+        client.add("Bond", 12.5, "EASY")
+    with pytest.raises(OSError):
+        client.count()
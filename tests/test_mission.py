@@ -0,0 +1,23 @@
+from leaderboard_service import LeaderboardClient
+from mission import Mission
+
+from test_leaderboard_service import free_port
+
+
+def play(mission):
+    mission.start()
+    p, q = mission.auto_primes()
+    mission.submit_primes(p, q)
+    key = mission.choose_e(mission.exponents[0])
+    mission.proceed()
+    mission.encrypt("HELLO", "BLOCK")
+    return key
+
+
+def test_unlock_survives_an_unwritable_leaderboard(tmp_path):
+    leaderboard = LeaderboardClient(str(tmp_path / "missing" / "lb.db"), port=free_port())
+    mission = Mission("Bond", "RSA-512", leaderboard=leaderboard)
+    key = play(mission)
+    result = mission.unlock(key.d)
+    assert "leaderboard database" in result["save_error"]
+    assert "".join(mission.reveal()) == "HELLO"
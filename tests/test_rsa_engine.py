@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import rsa_engine
+
+# Strong pseudoprime to the first 12 prime bases (psi_12 = 399165290221 * 798330580441).
+PSI_12 = 318665857834031151167461
+
+
+def naive_primes(limit):
+    flags = [True] * limit
+    flags[:2] = [False, False][:limit]
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = [False] * len(range(i * i, limit, i))
+    return [i for i, f in enumerate(flags) if f]
+
+
+def test_is_prime_rejects_psi_12():
+    assert PSI_12 == 399165290221 * 798330580441
+    assert not rsa_engine.is_prime(PSI_12)
+
+
+def test_is_prime_small_numbers():
+    primes = set(naive_primes(2000))
+    assert [n for n in range(2000) if rsa_engine.is_prime(n)] == sorted(primes)
+
+
+def test_prime_sieve_matches_naive_sieve():
+    for limit in range(3, 300):
+        sieve = rsa_engine.PrimeSieve(limit)
+        expected = naive_primes(limit)
+        assert sieve.primes(0, limit) == expected
+        assert sieve.primes(0, limit + 10) == expected
+        assert sieve.primes(limit // 3, limit) == [p for p in expected if p >= limit // 3]
+
+
+MULTIBYTE = "héllo ✓ 日本語 🔐 " * 20
+
+
+def stream_key():
+    key = rsa_engine.keygen_bits(256, rng=random.Random(5))
+    assert rsa_engine.supports_block_mode(key.n)
+    return key
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decrypt_stream_block_round_trip_with_small_chunks(monkeypatch, workers):
+    # one block per chunk, so multibyte characters straddle chunk boundaries
+    monkeypatch.setattr(rsa_engine, "STREAM_CHUNK_CHARS", 1)
+    monkeypatch.setattr(rsa_engine, "STREAM_PARALLEL_BLOCKS", 2)
+    key = stream_key()
+    cipher = rsa_engine.encrypt(MULTIBYTE, key.e, key.n, rsa_engine.MODE_BLOCK)
+
+    stream = rsa_engine.DecryptStream(cipher, key, rsa_engine.MODE_BLOCK, workers=workers)
+    assert len(stream.chunks) == len(cipher) > 1
+    assert (stream.futures is not None) == (workers > 1)
+    parts = list(stream)
+    assert "".join(parts) == MULTIBYTE
+    assert stream.read() == ""
+
+
+def test_decrypt_stream_take_and_decode(monkeypatch):
+    monkeypatch.setattr(rsa_engine, "STREAM_CHUNK_CHARS", 1)
+    key = stream_key()
+    cipher = rsa_engine.encrypt(MULTIBYTE, key.e, key.n, rsa_engine.MODE_BLOCK)
+
+    stream = rsa_engine.DecryptStream(cipher, key, rsa_engine.MODE_BLOCK, workers=1)
+    text = []
+    while not stream.done:
+        chunk, last = stream.take()
+        values = rsa_engine.decrypt_chunk(chunk, key, rsa_engine.MODE_BLOCK)
+        text.append(stream.decode(values, last))
+    assert "".join(text) == MULTIBYTE